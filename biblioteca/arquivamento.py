@@ -0,0 +1,219 @@
+"""Módulo de arquivamento de empréstimos antigos em segmentos compactados."""
+
+import glob
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from biblioteca.exportacao import exportar_emprestimos, ler_jsonl
+from biblioteca.models import Emprestimo, ResumoSegmento
+from biblioteca.sistema import SistemaBiblioteca
+
+# ===== RETENÇÃO EM CAMADAS =====
+# Empréstimos devolvidos há muito tempo saem da memória (camada quente) e vão
+# para segmentos imutáveis em disco (camada fria):
+# - segmento-NNNNNN.jsonl.gz: os empréstimos completos, compactados
+# - segmento-NNNNNN.json: resumo com período e contagens por livro/usuário
+# Os relatórios combinam a camada quente com os resumos, sem descompactar.
+
+PREFIXO_SEGMENTO = "segmento-"
+# Limita quantos empréstimos saem da memória de uma vez, e portanto por
+# quanto tempo registrar_segmento segura a trava do sistema
+TAMANHO_MAXIMO_SEGMENTO = 50_000
+_NUMERO_SEGMENTO = re.compile(re.escape(PREFIXO_SEGMENTO) + r"(\d+)\.")
+
+
+def _resumo_para_dict(resumo: ResumoSegmento) -> Dict[str, Any]:
+    """Serializa o resumo de um segmento para JSON."""
+    return {
+        "caminho": os.path.basename(resumo.caminho),
+        "quantidade": resumo.quantidade,
+        "data_inicio": resumo.data_inicio.isoformat(),
+        "data_fim": resumo.data_fim.isoformat(),
+        "atrasados": resumo.atrasados,
+        "emprestimos_por_livro": resumo.emprestimos_por_livro,
+        "emprestimos_por_usuario": {
+            str(id_usuario): total
+            for id_usuario, total in resumo.emprestimos_por_usuario.items()
+        },
+    }
+
+
+def _resumo_de_dict(dados: Dict[str, Any], diretorio: str) -> ResumoSegmento:
+    """Reconstrói o resumo de um segmento a partir do JSON gravado."""
+    return ResumoSegmento(
+        caminho=os.path.join(diretorio, dados["caminho"]),
+        quantidade=dados["quantidade"],
+        data_inicio=datetime.fromisoformat(dados["data_inicio"]),
+        data_fim=datetime.fromisoformat(dados["data_fim"]),
+        atrasados=dados["atrasados"],
+        emprestimos_por_livro=dados["emprestimos_por_livro"],
+        emprestimos_por_usuario={
+            int(id_usuario): total
+            for id_usuario, total in dados["emprestimos_por_usuario"].items()
+        },
+    )
+
+
+def _proximo_nome(diretorio: str) -> str:
+    """Retorna o nome base do próximo segmento livre no diretório.
+
+    Considera dados, resumos e temporários, de modo que um segmento órfão
+    (ex.: dados sem resumo após uma falha) nunca tem seu número reutilizado.
+    """
+    numeros = [
+        int(encontrado.group(1))
+        for nome in os.listdir(diretorio)
+        if (encontrado := _NUMERO_SEGMENTO.match(nome))
+    ]
+    numero = max(numeros, default=0) + 1
+    return os.path.join(diretorio, f"{PREFIXO_SEGMENTO}{numero:06d}")
+
+
+def _publicar(temporario: str, destino: str) -> None:
+    """Move um arquivo pronto para o destino final e o torna somente leitura.
+
+    Raises:
+        FileExistsError: Se o destino já existir, pois segmentos são imutáveis
+    """
+    if os.path.exists(destino):
+        raise FileExistsError(destino)
+    os.chmod(temporario, 0o444)
+    os.replace(temporario, destino)
+
+
+def _remover_temporarios(*caminhos: str) -> None:
+    """Remove arquivos temporários deixados por uma etapa que falhou."""
+    for caminho in caminhos:
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+
+def _gravar_segmento(
+    emprestimos: List[Emprestimo], diretorio: str, referencia: datetime
+) -> ResumoSegmento:
+    """Grava os dados e o resumo de um segmento e devolve o resumo.
+
+    Raises:
+        FileExistsError: Se o nome escolhido já estiver ocupado
+    """
+    base = _proximo_nome(diretorio)
+    caminho_dados = base + ".jsonl.gz"
+    temporario_dados = caminho_dados + ".tmp"
+    temporario_resumo = base + ".json.tmp"
+    try:
+        exportar_emprestimos(
+            emprestimos, temporario_dados, "jsonl", comprimir=True, agora=referencia
+        )
+        _publicar(temporario_dados, caminho_dados)
+
+        datas = [e.data_emprestimo for e in emprestimos]
+        resumo = ResumoSegmento(
+            caminho=caminho_dados,
+            quantidade=len(emprestimos),
+            data_inicio=min(datas),
+            data_fim=max(datas),
+            atrasados=sum(1 for e in emprestimos if e.esta_atrasado(referencia)),
+            emprestimos_por_livro=dict(Counter(e.livro.isbn for e in emprestimos)),
+            emprestimos_por_usuario=dict(Counter(e.usuario.id for e in emprestimos)),
+        )
+        with open(temporario_resumo, "w", encoding="utf-8") as arquivo:
+            json.dump(_resumo_para_dict(resumo), arquivo, ensure_ascii=False)
+        _publicar(temporario_resumo, base + ".json")
+    finally:
+        _remover_temporarios(temporario_dados, temporario_resumo)
+    return resumo
+
+
+def arquivar_emprestimos(
+    sistema: SistemaBiblioteca,
+    diretorio: str,
+    idade_minima: timedelta,
+    agora: Optional[datetime] = None,
+    tamanho_maximo: int = TAMANHO_MAXIMO_SEGMENTO,
+) -> List[ResumoSegmento]:
+    """Move empréstimos devolvidos há mais de `idade_minima` para segmentos.
+
+    Cada segmento e seu resumo são gravados antes de o sistema descartar os
+    empréstimos da memória; assim, uma falha no meio do processo nunca perde
+    dados (no máximo deixa um arquivo de dados sem resumo, que é ignorado).
+    Os empréstimos são divididos em segmentos de até `tamanho_maximo`,
+    ordenados por data, e cada um é registrado separadamente, para que os
+    empréstimos e devoluções não fiquem bloqueados durante todo o processo.
+    Deve haver apenas um arquivamento em execução por diretório.
+
+    Args:
+        sistema: Sistema cujos empréstimos serão arquivados
+        diretorio: Diretório dos segmentos
+        idade_minima: Tempo desde a devolução para que o empréstimo seja arquivado
+        agora: Instante de referência (padrão: datetime.now())
+        tamanho_maximo: Quantidade máxima de empréstimos por segmento
+
+    Returns:
+        List[ResumoSegmento]: Resumos dos segmentos criados (vazia se não havia
+            empréstimos elegíveis)
+    """
+    referencia = agora or datetime.now()
+    limite = referencia - idade_minima
+    snapshot = sistema.snapshot()
+    # Empréstimos devolvidos não mudam mais, então o snapshot é definitivo
+    antigos = [
+        e
+        for e in snapshot.emprestimos
+        if e.data_devolucao and e.data_devolucao < limite
+    ]
+    if not antigos:
+        return []
+
+    os.makedirs(diretorio, exist_ok=True)
+    # Segmentos com períodos contíguos permitem descartar mais segmentos
+    # inteiros em consultas por período
+    antigos.sort(key=lambda e: e.data_emprestimo)
+    resumos = []
+    for inicio in range(0, len(antigos), tamanho_maximo):
+        lote = antigos[inicio : inicio + tamanho_maximo]
+        resumo = _gravar_segmento(lote, diretorio, referencia)
+        sistema.registrar_segmento(resumo, {e.id for e in lote})
+        resumos.append(resumo)
+    return resumos
+
+
+def carregar_segmentos(
+    sistema: SistemaBiblioteca, diretorio: str
+) -> List[ResumoSegmento]:
+    """Registra no sistema os segmentos já existentes em um diretório.
+
+    Apenas os resumos são lidos; os dados compactados continuam em disco.
+    Segmentos já registrados são ignorados, então chamar a função novamente
+    para o mesmo diretório não conta empréstimos em dobro.
+
+    Args:
+        sistema: Sistema que passará a considerar os segmentos
+        diretorio: Diretório dos segmentos
+
+    Returns:
+        List[ResumoSegmento]: Resumos carregados agora, em ordem de criação
+    """
+    resumos = []
+    padrao = os.path.join(diretorio, f"{PREFIXO_SEGMENTO}*.json")
+    for caminho in sorted(glob.glob(padrao)):
+        with open(caminho, encoding="utf-8") as arquivo:
+            resumo = _resumo_de_dict(json.load(arquivo), diretorio)
+        if sistema.registrar_segmento(resumo, frozenset()):
+            resumos.append(resumo)
+    return resumos
+
+
+def ler_segmento(resumo: ResumoSegmento) -> Iterator[Dict[str, Any]]:
+    """Lê sob demanda os empréstimos de um segmento, um dicionário por linha.
+
+    Args:
+        resumo: Resumo do segmento a ser lido
+
+    Returns:
+        Iterator[Dict[str, Any]]: Empréstimos no formato da exportação JSONL
+    """
+    return ler_jsonl(resumo.caminho)
@@ -0,0 +1,492 @@
+"""Módulo de gravação e reprodução de cargas de trabalho do sistema."""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from biblioteca.isbn import isbn13_valido
+from biblioteca.models import Emprestimo, Livro, Usuario
+from biblioteca.relatorios import Relatorios
+from biblioteca.sistema import SistemaBiblioteca
+
+# ===== GRAVAÇÃO E REPRODUÇÃO DE CARGA =====
+# - GravadorCarga envolve o sistema e os relatórios e registra cada chamada
+#   (método, argumentos, instante, duração e resultado resumido)
+# - reproduzir() executa um trace em um sistema novo, com velocidade e
+#   concorrência configuráveis, e mede vazão, latência e divergências
+# - gerar_trace_dia() cria um trace sintético de um dia de circulação
+
+# Métodos internos ou que devolvem objetos sem representação estável
+METODOS_IGNORADOS = {"snapshot", "registrar_segmento"}
+# Métodos que alteram o estado; na reprodução concorrente eles continuam
+# sendo executados um de cada vez, na ordem do trace
+METODOS_ESCRITA = {
+    "adicionar_livro",
+    "atualizar_livro",
+    "remover_livro",
+    "cadastrar_usuario",
+    "atualizar_usuario",
+    "remover_usuario",
+    "realizar_emprestimo",
+    "realizar_devolucao",
+}
+
+
+@dataclass
+class Chamada:
+    """Uma chamada registrada em um trace."""
+
+    instante: float  # Segundos desde o início do trace
+    alvo: str  # "sistema" ou "relatorios"
+    metodo: str
+    args: List[Any] = field(default_factory=list)
+    duracao: float = 0.0
+    resultado: Any = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    erro: Optional[str] = None  # Nome da exceção lançada, se houver
+
+
+def resumir(valor: Any) -> Any:
+    """Reduz um resultado a um valor JSON comparável entre execuções.
+
+    Entidades são representadas por suas chaves (ISBN ou ID), de modo que
+    dois sistemas diferentes produzam o mesmo resumo para o mesmo estado.
+    """
+    if isinstance(valor, Livro):
+        return valor.isbn
+    if isinstance(valor, (Usuario, Emprestimo)):
+        return valor.id
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, float):
+        return round(valor, 6)
+    if isinstance(valor, (list, tuple)):
+        return [resumir(v) for v in valor]
+    if isinstance(valor, dict):
+        return {str(k): resumir(v) for k, v in valor.items()}
+    return valor
+
+
+def _codificar_arg(valor: Any) -> Any:
+    """Codifica um argumento para JSON, preservando datas."""
+    if isinstance(valor, datetime):
+        return {"__datetime__": valor.isoformat()}
+    return valor
+
+
+def _decodificar_arg(valor: Any) -> Any:
+    """Reverte a codificação de _codificar_arg."""
+    if isinstance(valor, dict) and "__datetime__" in valor:
+        return datetime.fromisoformat(valor["__datetime__"])
+    return valor
+
+
+def _executar(
+    metodo: Callable[..., Any], args: List[Any], kwargs: Dict[str, Any]
+) -> Any:
+    """Executa uma chamada, consumindo resultados preguiçosos (geradores).
+
+    Métodos como Relatorios.historico_arquivado só fazem o trabalho durante a
+    iteração; consumi-los aqui faz a duração medida incluir esse trabalho e
+    entrega ao trace uma lista serializável em vez do gerador.
+    """
+    resultado = metodo(*args, **kwargs)
+    if isinstance(resultado, Iterator):
+        return list(resultado)
+    return resultado
+
+
+class _Interceptador:
+    """Repassa chamadas ao objeto real e as registra no gravador."""
+
+    def __init__(self, gravador: "GravadorCarga", alvo: str, objeto: Any) -> None:
+        self._gravador = gravador
+        self._alvo = alvo
+        self._objeto = objeto
+
+    def __getattr__(self, nome: str) -> Any:
+        atributo = getattr(self._objeto, nome)
+        if not callable(atributo) or nome.startswith("_"):
+            return atributo
+        if nome in METODOS_IGNORADOS:
+            return atributo
+
+        def chamar(*args: Any, **kwargs: Any) -> Any:
+            instante = self._gravador.relogio()
+            resultado = None
+            erro = None
+            inicio = time.perf_counter()
+            try:
+                # Geradores são devolvidos já consumidos, como lista
+                resultado = _executar(atributo, list(args), kwargs)
+                return resultado
+            except Exception as excecao:
+                erro = type(excecao).__name__
+                raise
+            finally:
+                # Chamadas que falham também fazem parte da carga
+                self._gravador.registrar(
+                    Chamada(
+                        instante,
+                        self._alvo,
+                        nome,
+                        [_codificar_arg(a) for a in args],
+                        time.perf_counter() - inicio,
+                        resumir(resultado),
+                        {k: _codificar_arg(v) for k, v in kwargs.items()},
+                        erro,
+                    )
+                )
+
+        return chamar
+
+
+class GravadorCarga:
+    """Classe que grava a sequência de chamadas feitas ao sistema.
+
+    Use `gravador.sistema` e `gravador.relatorios` no lugar dos objetos reais;
+    as chamadas são repassadas e registradas em `gravador.chamadas`. Métodos
+    que devolvem geradores são consumidos na hora e devolvem uma lista.
+    """
+
+    def __init__(
+        self,
+        sistema: SistemaBiblioteca,
+        relogio: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """Inicializa o gravador.
+
+        Args:
+            sistema: Sistema cujas chamadas serão gravadas
+            relogio: Função que devolve o instante atual em segundos
+                (padrão: tempo real decorrido desde a criação do gravador)
+        """
+        inicio = time.perf_counter()
+        self.relogio = relogio or (lambda: time.perf_counter() - inicio)
+        self.chamadas: List[Chamada] = []
+        self._trava = threading.Lock()
+        self.sistema: Any = _Interceptador(self, "sistema", sistema)
+        self.relatorios: Any = _Interceptador(self, "relatorios", Relatorios(sistema))
+
+    def registrar(self, chamada: Chamada) -> None:
+        """Adiciona uma chamada ao trace."""
+        with self._trava:
+            self.chamadas.append(chamada)
+
+    def salvar(self, caminho: str) -> None:
+        """Grava o trace em JSONL, uma chamada por linha."""
+        salvar_trace(self.chamadas, caminho)
+
+
+def salvar_trace(chamadas: Iterable[Chamada], caminho: str) -> None:
+    """Grava um trace em JSONL, uma chamada por linha.
+
+    Args:
+        chamadas: Chamadas do trace
+        caminho: Arquivo de destino
+    """
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for chamada in chamadas:
+            arquivo.write(json.dumps(asdict(chamada), ensure_ascii=False) + "\n")
+
+
+def carregar_trace(caminho: str) -> List[Chamada]:
+    """Lê um trace gravado em JSONL.
+
+    Args:
+        caminho: Arquivo do trace
+
+    Returns:
+        List[Chamada]: Chamadas ordenadas por instante
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        chamadas = [Chamada(**json.loads(linha)) for linha in arquivo if linha.strip()]
+    return sorted(chamadas, key=lambda c: c.instante)
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Calcula o percentil `p` (0 a 100) pelo método do posto mais próximo."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    posicao = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[posicao]
+
+
+@dataclass
+class ResultadoReproducao:
+    """Métricas de uma reprodução de trace.
+
+    As latências são medidas a partir do instante em que cada chamada estava
+    agendada, e não de quando começou a executar: se a reprodução ficar para
+    trás (fila de escritas ou de leituras cheia), o atraso entra nos
+    percentis em vez de ficar escondido. O tempo de fila, sozinho, fica em
+    `esperas`.
+
+    `divergencias` lista escritas e, na reprodução sequencial, também
+    leituras cujo resultado difere do gravado. Na reprodução concorrente, as
+    leituras podem observar escritas antes ou depois da posição original,
+    então suas diferenças ficam separadas em `divergencias_ordem`.
+    """
+
+    chamadas: int
+    segundos: float
+    latencias: Dict[str, List[float]]
+    divergencias: List[Tuple[Chamada, Any]]
+    divergencias_ordem: List[Tuple[Chamada, Any]] = field(default_factory=list)
+    esperas: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def vazao(self) -> float:
+        """Chamadas por segundo."""
+        return self.chamadas / self.segundos if self.segundos > 0 else 0.0
+
+    def resumo(self) -> Dict[str, Any]:
+        """Monta um dicionário com vazão, percentis de latência e divergências.
+
+        Returns:
+            Dict[str, Any]: Métricas gerais e por método (latências e esperas
+                em ms)
+        """
+        todas = [v for lista in self.latencias.values() for v in lista]
+        esperas = [v for lista in self.esperas.values() for v in lista]
+
+        def percentis(valores: List[float]) -> Dict[str, float]:
+            return {
+                f"p{p}": round(percentil(valores, p) * 1000, 3) for p in (50, 95, 99)
+            }
+
+        return {
+            "chamadas": self.chamadas,
+            "segundos": round(self.segundos, 3),
+            "vazao": round(self.vazao, 1),
+            "latencia_ms": percentis(todas),
+            "espera_ms": percentis(esperas),
+            "por_metodo": {
+                metodo: {
+                    "chamadas": len(valores),
+                    **percentis(valores),
+                    "espera_p99": percentis(self.esperas.get(metodo, []))["p99"],
+                }
+                for metodo, valores in sorted(self.latencias.items())
+            },
+            "divergencias": len(self.divergencias),
+            "divergencias_ordem": len(self.divergencias_ordem),
+        }
+
+
+def reproduzir(
+    chamadas: List[Chamada],
+    velocidade: float = 0.0,
+    concorrencia: int = 1,
+    fabrica: Callable[[], SistemaBiblioteca] = SistemaBiblioteca,
+) -> ResultadoReproducao:
+    """Reexecuta um trace em um sistema novo.
+
+    Com `concorrencia` > 1, as escritas (METODOS_ESCRITA) continuam sendo
+    executadas uma de cada vez e na ordem do trace, já que os IDs de
+    empréstimo dependem dessa ordem; as leituras (buscas e relatórios) rodam
+    em paralelo em até `concorrencia` threads. Assim, divergências em escritas
+    indicam mudança real de comportamento, enquanto as de leituras concorrentes
+    são reportadas à parte, como efeito da ordem de execução.
+
+    Args:
+        chamadas: Chamadas do trace, em ordem de instante
+        velocidade: Fator de aceleração em relação ao trace original
+            (2.0 = duas vezes mais rápido); 0 executa sem pausas
+        concorrencia: Número de threads que executam as leituras
+        fabrica: Função que cria o sistema usado na reprodução
+
+    Returns:
+        ResultadoReproducao: Vazão, latências por método e divergências
+            entre os resultados gravados e os obtidos
+    """
+    sistema = fabrica()
+    alvos = {"sistema": sistema, "relatorios": Relatorios(sistema)}
+    latencias: Dict[str, List[float]] = {}
+    esperas: Dict[str, List[float]] = {}
+    divergencias: List[Tuple[Chamada, Any]] = []
+    divergencias_ordem: List[Tuple[Chamada, Any]] = []
+    concorrente = concorrencia > 1
+    trava = threading.Lock()
+
+    def executar(chamada: Chamada, agendado: float) -> None:
+        metodo = getattr(alvos[chamada.alvo], chamada.metodo)
+        args = [_decodificar_arg(a) for a in chamada.args]
+        kwargs = {k: _decodificar_arg(v) for k, v in chamada.kwargs.items()}
+        obtido = None
+        erro = None
+        inicio = time.perf_counter()
+        try:
+            obtido = resumir(_executar(metodo, args, kwargs))
+        except Exception as excecao:
+            erro = type(excecao).__name__
+        fim = time.perf_counter()
+        chave = f"{chamada.alvo}.{chamada.metodo}"
+        with trava:
+            # Medir a partir do agendamento evita a omissão coordenada:
+            # chamadas que esperaram na fila contam o tempo de espera
+            latencias.setdefault(chave, []).append(fim - agendado)
+            esperas.setdefault(chave, []).append(max(0.0, inicio - agendado))
+            if obtido != chamada.resultado or erro != chamada.erro:
+                leitura = chamada.metodo not in METODOS_ESCRITA
+                destino = (
+                    divergencias_ordem if concorrente and leitura else divergencias
+                )
+                destino.append((chamada, erro or obtido))
+
+    inicio = time.perf_counter()
+    base = chamadas[0].instante if chamadas else 0.0
+    with (
+        ThreadPoolExecutor(max_workers=1) as escritas,
+        ThreadPoolExecutor(max_workers=max(1, concorrencia)) as leituras,
+    ):
+        pendentes: List[Future[None]] = []
+        for chamada in chamadas:
+            if velocidade > 0:
+                agendado = inicio + (chamada.instante - base) / velocidade
+                espera = agendado - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+            else:
+                # Sem pausas, cada chamada está agendada para quando é despachada
+                agendado = time.perf_counter()
+            if not concorrente:
+                executar(chamada, agendado)
+            elif chamada.metodo in METODOS_ESCRITA:
+                # Um único executor preserva a ordem das escritas
+                pendentes.append(escritas.submit(executar, chamada, agendado))
+            else:
+                pendentes.append(leituras.submit(executar, chamada, agendado))
+        for pendente in pendentes:
+            pendente.result()
+
+    return ResultadoReproducao(
+        len(chamadas),
+        time.perf_counter() - inicio,
+        latencias,
+        divergencias,
+        divergencias_ordem,
+        esperas,
+    )
+
+
+def _isbn_sintetico(numero: int) -> str:
+    """Gera um ISBN-13 válido a partir de um número sequencial."""
+    base = f"978{numero:09d}"
+    return next(base + str(d) for d in range(10) if isbn13_valido(base + str(d)))
+
+
+def gerar_trace_dia(
+    livros: int = 500,
+    usuarios: int = 200,
+    emprestimos: int = 1000,
+    semente: int = 42,
+) -> List[Chamada]:
+    """Gera um trace sintético de um dia de circulação (8h às 20h).
+
+    O modelo inclui cadastro inicial do acervo, pico de empréstimos pela
+    manhã, devoluções ao longo da tarde, buscas durante todo o dia e
+    atualização dos relatórios a cada hora. As chamadas são executadas em
+    um sistema real durante a geração, então os resultados gravados servem
+    de referência para detectar divergências na reprodução.
+
+    Args:
+        livros: Quantidade de livros no acervo
+        usuarios: Quantidade de usuários cadastrados
+        emprestimos: Quantidade aproximada de tentativas de empréstimo no dia
+        semente: Semente do gerador aleatório, para traces reprodutíveis
+
+    Returns:
+        List[Chamada]: Chamadas ordenadas por instante (segundos desde 0h)
+    """
+    aleatorio = random.Random(semente)
+    relogio = [8 * 3600.0]
+    real = SistemaBiblioteca()
+    gravador = GravadorCarga(real, relogio=lambda: relogio[0])
+    sistema, relatorios = gravador.sistema, gravador.relatorios
+
+    # Cadastro inicial, antes da abertura
+    isbns = [_isbn_sintetico(i) for i in range(livros)]
+    for i, isbn in enumerate(isbns):
+        sistema.adicionar_livro(
+            f"Livro {i}", f"Autor {i % 50}", 1950 + i % 70, isbn, "Geral"
+        )
+    for i in range(usuarios):
+        sistema.cadastrar_usuario(
+            f"Usuário {i}", f"usuario{i}@email.com", "11900000000"
+        )
+
+    # Eventos do dia: (instante, tipo)
+    eventos: List[Tuple[float, str]] = []
+    for _ in range(emprestimos):
+        # Pico matinal: distribuição concentrada por volta das 10h
+        eventos.append(
+            (min(max(aleatorio.gauss(10 * 3600, 3600), 28800), 72000), "emp")
+        )
+    for _ in range(int(emprestimos * 0.8)):
+        eventos.append((aleatorio.uniform(11 * 3600, 19 * 3600), "dev"))
+    for _ in range(emprestimos * 2):
+        eventos.append((aleatorio.uniform(8 * 3600, 20 * 3600), "busca"))
+    eventos.extend((hora * 3600.0, "relatorio") for hora in range(9, 21))
+    eventos.sort()
+
+    for instante, tipo in eventos:
+        relogio[0] = instante
+        if tipo == "emp":
+            sistema.realizar_emprestimo(
+                aleatorio.randint(1, usuarios), aleatorio.choice(isbns), 14
+            )
+        elif tipo == "dev":
+            # Consulta direta, fora do trace: só escolhe qual empréstimo devolver
+            ativos = real.listar_emprestimos_ativos()
+            if ativos:
+                sistema.realizar_devolucao(aleatorio.choice(ativos).id)
+        elif tipo == "busca":
+            sistema.buscar_livros(f"Livro {aleatorio.randrange(livros)}")
+        else:
+            relatorios.estatisticas_gerais()
+            relatorios.livros_mais_emprestados()
+            relatorios.usuarios_mais_ativos()
+
+    return gravador.chamadas
+
+
+def main() -> None:
+    """Ponto de entrada da linha de comando (gerar / reproduzir)."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    gerar = comandos.add_parser("gerar", help="gera um trace sintético de um dia")
+    gerar.add_argument("saida")
+    gerar.add_argument("--emprestimos", type=int, default=1000)
+    gerar.add_argument("--semente", type=int, default=42)
+
+    repro = comandos.add_parser("reproduzir", help="reproduz um trace gravado")
+    repro.add_argument("trace")
+    repro.add_argument("--velocidade", type=float, default=0.0)
+    repro.add_argument("--concorrencia", type=int, default=1)
+
+    opcoes = parser.parse_args()
+    if opcoes.comando == "gerar":
+        chamadas = gerar_trace_dia(
+            emprestimos=opcoes.emprestimos, semente=opcoes.semente
+        )
+        salvar_trace(chamadas, opcoes.saida)
+        print(f"{len(chamadas)} chamadas gravadas em {opcoes.saida}")
+    else:
+        resultado = reproduzir(
+            carregar_trace(opcoes.trace), opcoes.velocidade, opcoes.concorrencia
+        )
+        print(json.dumps(resultado.resumo(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Módulo de exportação de dados do sistema de biblioteca."""
+
+import csv
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain, islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    TypeVar,
+    Union,
+)
+
+from biblioteca.models import Emprestimo, Livro, Usuario
+from biblioteca.sistema import SistemaBiblioteca, SnapshotSistema
+
+# ===== PARADIGMA FUNCIONAL =====
+# A exportação é um pipeline de funções puras:
+# registros -> lotes -> dicionários -> linhas de texto -> arquivo.
+# Os registros são consumidos de forma preguiçosa (iteradores), então a
+# memória usada depende do tamanho do lote e não do total de registros.
+
+T = TypeVar("T")
+
+FORMATOS = ("csv", "jsonl")
+TAMANHO_LOTE = 1000
+TAMANHO_BUFFER = 1024 * 1024
+
+CAMPOS_LIVRO = ["isbn", "titulo", "autor", "ano", "categoria", "disponivel"]
+CAMPOS_USUARIO = ["id", "nome", "email", "telefone", "ativo", "emprestimos_ativos"]
+CAMPOS_EMPRESTIMO = [
+    "id",
+    "id_usuario",
+    "isbn",
+    "data_emprestimo",
+    "data_prevista_devolucao",
+    "data_devolucao",
+    "atrasado",
+]
+
+
+@dataclass(frozen=True)
+class ResultadoExportacao:
+    """Resumo de uma exportação concluída."""
+
+    caminho: str
+    registros: int
+    segundos: float
+
+    @property
+    def registros_por_segundo(self) -> float:
+        """Vazão da exportação em registros por segundo."""
+        return self.registros / self.segundos if self.segundos > 0 else 0.0
+
+
+def livro_para_dict(livro: Livro) -> Dict[str, Any]:
+    """Monta o dicionário exportado de um livro."""
+    return {
+        "isbn": livro.isbn,
+        "titulo": livro.titulo,
+        "autor": livro.autor,
+        "ano": livro.ano,
+        "categoria": livro.categoria,
+        "disponivel": livro.disponivel,
+    }
+
+
+def usuario_para_dict(usuario: Usuario) -> Dict[str, Any]:
+    """Monta o dicionário exportado de um usuário."""
+    return {
+        "id": usuario.id,
+        "nome": usuario.nome,
+        "email": usuario.email,
+        "telefone": usuario.telefone,
+        "ativo": usuario.ativo,
+        "emprestimos_ativos": len(usuario.emprestimos_ativos),
+    }
+
+
+def emprestimo_para_dict(emprestimo: Emprestimo, agora: datetime) -> Dict[str, Any]:
+    """Monta o dicionário exportado de um empréstimo.
+
+    Args:
+        emprestimo: Empréstimo a converter
+        agora: Instante único usado para avaliar o atraso de todos os registros
+
+    Returns:
+        Dict[str, Any]: Campos do empréstimo com datas em ISO 8601
+    """
+    devolucao = emprestimo.data_devolucao
+    return {
+        "id": emprestimo.id,
+        "id_usuario": emprestimo.usuario.id,
+        "isbn": emprestimo.livro.isbn,
+        "data_emprestimo": emprestimo.data_emprestimo.isoformat(),
+        "data_prevista_devolucao": emprestimo.data_prevista_devolucao.isoformat(),
+        "data_devolucao": devolucao.isoformat() if devolucao else None,
+        "atrasado": emprestimo.esta_atrasado(agora),
+    }
+
+
+def em_lotes(registros: Iterable[T], tamanho: int = TAMANHO_LOTE) -> Iterator[List[T]]:
+    """Agrupa um iterável em listas de até `tamanho` elementos, sob demanda."""
+    iterador = iter(registros)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def ler_jsonl(caminho: str) -> Iterator[Dict[str, Any]]:
+    """Lê sob demanda um arquivo JSONL (compactado ou não), um registro por linha.
+
+    Args:
+        caminho: Arquivo JSONL; se terminar em ".gz", é lido com gzip
+
+    Returns:
+        Iterator[Dict[str, Any]]: Registros do arquivo, na ordem gravada
+    """
+    if caminho.endswith(".gz"):
+        arquivo: TextIO = gzip.open(caminho, "rt", encoding="utf-8")
+    else:
+        arquivo = open(caminho, encoding="utf-8")
+    with arquivo:
+        for linha in arquivo:
+            yield json.loads(linha)
+
+
+def _abrir(caminho: str, comprimir: bool) -> TextIO:
+    """Abre o arquivo de saída em modo texto com buffer, opcionalmente gzip."""
+    if comprimir:
+        return gzip.open(caminho, "wt", compresslevel=6, encoding="utf-8", newline="")
+    return open(caminho, "w", encoding="utf-8", newline="", buffering=TAMANHO_BUFFER)
+
+
+def exportar(
+    registros: Iterable[T],
+    converter: Callable[[T], Dict[str, Any]],
+    campos: List[str],
+    caminho: str,
+    formato: str = "csv",
+    comprimir: bool = False,
+    tamanho_lote: int = TAMANHO_LOTE,
+) -> ResultadoExportacao:
+    """Exporta registros em streaming para CSV ou JSONL.
+
+    Args:
+        registros: Registros a exportar (pode ser um gerador)
+        converter: Função que transforma um registro em dicionário
+        campos: Ordem das colunas no CSV
+        caminho: Arquivo de destino
+        formato: "csv" ou "jsonl"
+        comprimir: Se True, grava o arquivo compactado com gzip
+        tamanho_lote: Quantidade de registros formatados por escrita
+
+    Returns:
+        ResultadoExportacao: Caminho, total de registros e tempo gasto
+
+    Raises:
+        ValueError: Se o formato não for suportado
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato não suportado: {formato}")
+
+    inicio = time.perf_counter()
+    total = 0
+    with _abrir(caminho, comprimir) as arquivo:
+        if formato == "csv":
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            for lote in em_lotes(registros, tamanho_lote):
+                escritor.writerows(map(converter, lote))
+                total += len(lote)
+        else:
+            codificar = json.JSONEncoder(ensure_ascii=False).encode
+            for lote in em_lotes(registros, tamanho_lote):
+                arquivo.write("".join(codificar(converter(r)) + "\n" for r in lote))
+                total += len(lote)
+
+    return ResultadoExportacao(caminho, total, time.perf_counter() - inicio)
+
+
+def exportar_livros(
+    livros: Iterable[Livro], caminho: str, formato: str = "csv", comprimir: bool = False
+) -> ResultadoExportacao:
+    """Exporta o catálogo de livros."""
+    return exportar(livros, livro_para_dict, CAMPOS_LIVRO, caminho, formato, comprimir)
+
+
+def exportar_usuarios(
+    usuarios: Iterable[Usuario],
+    caminho: str,
+    formato: str = "csv",
+    comprimir: bool = False,
+) -> ResultadoExportacao:
+    """Exporta o cadastro de usuários."""
+    return exportar(
+        usuarios, usuario_para_dict, CAMPOS_USUARIO, caminho, formato, comprimir
+    )
+
+
+def exportar_emprestimos(
+    emprestimos: Iterable[Emprestimo],
+    caminho: str,
+    formato: str = "csv",
+    comprimir: bool = False,
+    agora: Optional[datetime] = None,
+) -> ResultadoExportacao:
+    """Exporta o histórico de empréstimos.
+
+    O atraso de todos os empréstimos é avaliado contra um único instante,
+    capturado no início da exportação (ou informado em `agora`).
+    """
+    referencia = agora or datetime.now()
+    return exportar(
+        emprestimos,
+        lambda e: emprestimo_para_dict(e, referencia),
+        CAMPOS_EMPRESTIMO,
+        caminho,
+        formato,
+        comprimir,
+    )
+
+
+def exportar_sistema(
+    sistema: Union[SistemaBiblioteca, SnapshotSistema],
+    diretorio: str,
+    formato: str = "csv",
+    comprimir: bool = False,
+    incluir_arquivados: bool = True,
+) -> List[ResultadoExportacao]:
+    """Exporta livros, usuários e empréstimos de um mesmo snapshot.
+
+    Livros, usuários e empréstimos são versionados juntos, então
+    `disponivel` e `emprestimos_ativos` no snapshot já concordam com os
+    empréstimos exportados, sem recálculo.
+
+    Args:
+        sistema: Sistema ou snapshot a exportar
+        diretorio: Diretório onde os arquivos serão criados
+        formato: "csv" ou "jsonl"
+        comprimir: Se True, gera arquivos .gz
+        incluir_arquivados: Se True, o arquivo de empréstimos também recebe,
+            após os empréstimos em memória, os registros dos segmentos
+
+    Returns:
+        List[ResultadoExportacao]: Um resultado por arquivo gerado
+    """
+    snapshot = sistema.snapshot()
+    os.makedirs(diretorio, exist_ok=True)
+    extensao = formato + (".gz" if comprimir else "")
+    agora = datetime.now()
+
+    def caminho(nome: str) -> str:
+        return os.path.join(diretorio, f"{nome}.{extensao}")
+
+    # Segmentos já guardam os empréstimos no formato da exportação
+    emprestimos = chain(
+        (emprestimo_para_dict(e, agora) for e in snapshot.emprestimos),
+        chain.from_iterable(
+            ler_jsonl(segmento.caminho)
+            for segmento in (snapshot.segmentos if incluir_arquivados else ())
+        ),
+    )
+
+    return [
+        exportar(
+            snapshot.livros,
+            livro_para_dict,
+            CAMPOS_LIVRO,
+            caminho("livros"),
+            formato,
+            comprimir,
+        ),
+        exportar(
+            snapshot.usuarios,
+            usuario_para_dict,
+            CAMPOS_USUARIO,
+            caminho("usuarios"),
+            formato,
+            comprimir,
+        ),
+        exportar(
+            emprestimos,
+            lambda registro: registro,
+            CAMPOS_EMPRESTIMO,
+            caminho("emprestimos"),
+            formato,
+            comprimir,
+        ),
+    ]
@@ -0,0 +1,80 @@
+"""Módulo de normalização e validação de ISBN."""
+
+from typing import Optional
+
+# ===== PARADIGMA FUNCIONAL =====
+# Funções puras: recebem uma string e devolvem um valor novo,
+# sem efeitos colaterais. Toda a validação de ISBN fica concentrada aqui.
+
+# Prefixos EAN-13 reservados para livros
+PREFIXOS_ISBN13 = ("978", "979")
+
+
+def _limpar_isbn(isbn: str) -> str:
+    """Remove hífens e espaços e padroniza o dígito 'X' em maiúsculo."""
+    return isbn.replace("-", "").replace(" ", "").upper()
+
+
+def _digito_verificador_isbn13(doze_digitos: str) -> str:
+    """Calcula o dígito verificador de um ISBN-13 a partir dos 12 primeiros."""
+    soma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(doze_digitos))
+    return str((10 - soma % 10) % 10)
+
+
+def isbn10_valido(isbn: str) -> bool:
+    """Verifica se a string (já limpa) é um ISBN-10 válido.
+
+    Args:
+        isbn: ISBN sem hífens ou espaços
+
+    Returns:
+        bool: True se o formato e o dígito verificador estiverem corretos
+    """
+    if len(isbn) != 10 or not isbn[:9].isdigit():
+        return False
+    if not (isbn[9].isdigit() or isbn[9] == "X"):
+        return False
+    valores = [int(d) for d in isbn[:9]] + [10 if isbn[9] == "X" else int(isbn[9])]
+    return sum((10 - i) * v for i, v in enumerate(valores)) % 11 == 0
+
+
+def isbn13_valido(isbn: str) -> bool:
+    """Verifica se a string (já limpa) é um ISBN-13 válido.
+
+    Além do dígito verificador, exige o prefixo 978 ou 979 ("Bookland"),
+    para não aceitar outros códigos EAN-13, como códigos de barras de produtos.
+
+    Args:
+        isbn: ISBN sem hífens ou espaços
+
+    Returns:
+        bool: True se o formato, o prefixo e o dígito verificador estiverem
+            corretos
+    """
+    return (
+        len(isbn) == 13
+        and isbn.isdigit()
+        and isbn[:3] in PREFIXOS_ISBN13
+        and _digito_verificador_isbn13(isbn[:12]) == isbn[12]
+    )
+
+
+def normalizar_isbn(isbn: str) -> Optional[str]:
+    """Normaliza um ISBN-10 ou ISBN-13 para a forma canônica ISBN-13.
+
+    Hífens e espaços são ignorados, de modo que "85-359-1068-9",
+    "978-85-359-1068-1" e "9788535910681" resultam na mesma chave.
+
+    Args:
+        isbn: ISBN informado pelo usuário
+
+    Returns:
+        Optional[str]: ISBN-13 apenas com dígitos ou None se o ISBN for inválido
+    """
+    limpo = _limpar_isbn(isbn)
+    if isbn13_valido(limpo):
+        return limpo
+    if isbn10_valido(limpo):
+        base = "978" + limpo[:9]
+        return base + _digito_verificador_isbn13(base)
+    return None
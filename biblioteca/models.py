@@ -2,16 +2,19 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Optional, Tuple
 
 # ===== PARADIGMA ORIENTADO A OBJETOS =====
 # Este arquivo demonstra os principais conceitos de OO:
 # - Encapsulamento: através das classes e seus atributos
 # - Composição: relacionamentos entre as classes
 # - Polimorfismo: através da sobrescrita de métodos como __str__
+# As entidades são imutáveis (frozen): o sistema registra cada alteração
+# criando uma nova versão com dataclasses.replace, o que permite que
+# snapshots antigos continuem vendo o estado do instante em que foram tirados.
 
 
-@dataclass
+@dataclass(frozen=True)
 class Livro:
     """Classe que representa um livro na biblioteca."""
 
@@ -31,7 +34,7 @@ class Livro:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class Usuario:
     """Classe que representa um usuário do sistema de biblioteca."""
 
@@ -40,8 +43,10 @@ class Usuario:
     email: str
     telefone: str
     ativo: bool = True
-    # Exemplo de composição: Usuario possui uma lista de empréstimos
-    emprestimos_ativos: List["Emprestimo"] = field(default_factory=list)
+    # IDs dos empréstimos ativos. Guardar os próprios empréstimos criaria uma
+    # cadeia de versões (empréstimo -> usuário -> empréstimo anterior -> ...)
+    # que nunca seria liberada enquanto o usuário tivesse algum livro em mãos
+    emprestimos_ativos: Tuple[int, ...] = ()
 
     def __str__(self) -> str:
         """Representação textual do usuário."""
@@ -52,7 +57,7 @@ class Usuario:
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class Emprestimo:
     """Classe que representa um empréstimo de livro."""
 
@@ -64,11 +69,17 @@ class Emprestimo:
     data_devolucao: Optional[datetime] = None
 
     # Encapsula a lógica de negócio (outro exemplo de encapsulamento)
-    def esta_atrasado(self) -> bool:
-        """Verifica se o empréstimo está atrasado."""
+    def esta_atrasado(self, agora: Optional[datetime] = None) -> bool:
+        """Verifica se o empréstimo está atrasado.
+
+        Args:
+            agora: Instante de referência para empréstimos em andamento
+                (padrão: datetime.now()); permite avaliar muitos registros
+                contra um mesmo instante capturado uma única vez
+        """
         if self.data_devolucao:
             return self.data_devolucao > self.data_prevista_devolucao
-        return datetime.now() > self.data_prevista_devolucao
+        return (agora or datetime.now()) > self.data_prevista_devolucao
 
     def __str__(self) -> str:
         """Representação textual do empréstimo."""
@@ -81,3 +92,20 @@ class Emprestimo:
             f"Previsão devolução: {self.data_prevista_devolucao.strftime('%d/%m/%Y')}\n"
             f"Status: {status}{atraso}"
         )
+
+
+@dataclass(frozen=True)
+class ResumoSegmento:
+    """Resumo de um segmento compactado de empréstimos arquivados.
+
+    Guarda o período coberto e as contagens por livro e por usuário, para que
+    relatórios de histórico não precisem descompactar o segmento.
+    """
+
+    caminho: str
+    quantidade: int
+    data_inicio: datetime  # Menor data_emprestimo do segmento
+    data_fim: datetime  # Maior data_emprestimo do segmento
+    atrasados: int
+    emprestimos_por_livro: Dict[str, int] = field(default_factory=dict)
+    emprestimos_por_usuario: Dict[int, int] = field(default_factory=dict)
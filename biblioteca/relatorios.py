@@ -1,10 +1,12 @@
 """Módulo de relatórios do sistema de biblioteca."""
 
 from collections import Counter
-from typing import List, Tuple
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
+from biblioteca.arquivamento import ler_segmento
 from biblioteca.models import Emprestimo, Livro, Usuario
-from biblioteca.sistema import SistemaBiblioteca
+from biblioteca.sistema import SistemaBiblioteca, SnapshotSistema
 
 # ===== PARADIGMA FUNCIONAL =====
 # Este arquivo demonstra o paradigma funcional através de:
@@ -12,13 +14,21 @@ from biblioteca.sistema import SistemaBiblioteca
 # - Uso de funções de ordem superior (map, filter, sorted)
 # - Processamento de coleções de forma funcional
 # - Uso de expressões lambda
+# Cada relatório lê um snapshot imutável do sistema, de modo que empréstimos
+# e devoluções concorrentes não alteram os dados no meio do processamento.
+# Empréstimos arquivados entram nos totais pelos resumos dos segmentos.
 
 
 class Relatorios:
     """Classe responsável por gerar relatórios do sistema de biblioteca."""
 
-    def __init__(self, sistema: SistemaBiblioteca) -> None:
-        """Inicializa a classe Relatorios com o sistema de biblioteca."""
+    def __init__(self, sistema: Union[SistemaBiblioteca, SnapshotSistema]) -> None:
+        """Inicializa a classe Relatorios com o sistema de biblioteca.
+
+        Args:
+            sistema: Sistema em uso, para relatórios sempre atualizados, ou um
+                snapshot fixo, para que vários relatórios vejam o mesmo instante
+        """
         self.sistema = sistema
 
     def livros_mais_emprestados(self) -> List[Tuple[Livro, int]]:
@@ -31,9 +41,25 @@ class Relatorios:
         # Exemplo de programação funcional:
         # - Uso de funções de ordem superior (Counter)
         # - Transformação de dados sem modificar estado
-        contagem = Counter(emp.livro for emp in self.sistema.emprestimos)
+        snapshot = self.sistema.snapshot()
+        contagem = Counter(emp.livro.isbn for emp in snapshot.emprestimos)
+        for segmento in snapshot.segmentos:
+            contagem.update(segmento.emprestimos_por_livro)
+
+        # Livros removidos do acervo só aparecem se ainda houver empréstimo
+        # em memória que os referencie
+        livros: Dict[str, Livro] = {
+            emp.livro.isbn: emp.livro for emp in snapshot.emprestimos
+        }
+        livros.update((livro.isbn, livro) for livro in snapshot.livros)
         return sorted(
-            contagem.items(), key=lambda x: x[1], reverse=True  # Função lambda
+            (
+                (livros[isbn], total)
+                for isbn, total in contagem.items()
+                if isbn in livros
+            ),
+            key=lambda x: x[1],  # Função lambda
+            reverse=True,
         )
 
     def usuarios_mais_ativos(self) -> List[Tuple[Usuario, int]]:
@@ -45,8 +71,20 @@ class Relatorios:
                 ordenada de forma decrescente por quantidade.
         """
         # Outro exemplo de processamento funcional de dados
-        contagem = Counter(emp.usuario for emp in self.sistema.emprestimos)
-        return sorted(contagem.items(), key=lambda x: x[1], reverse=True)
+        snapshot = self.sistema.snapshot()
+        contagem = Counter(emp.usuario.id for emp in snapshot.emprestimos)
+        for segmento in snapshot.segmentos:
+            contagem.update(segmento.emprestimos_por_usuario)
+
+        usuarios: Dict[int, Usuario] = {
+            emp.usuario.id: emp.usuario for emp in snapshot.emprestimos
+        }
+        usuarios.update((usuario.id, usuario) for usuario in snapshot.usuarios)
+        return sorted(
+            ((usuarios[i], total) for i, total in contagem.items() if i in usuarios),
+            key=lambda x: x[1],
+            reverse=True,
+        )
 
     def estatisticas_gerais(self) -> dict[str, float]:
         """Retorna estatísticas gerais do sistema.
@@ -57,24 +95,34 @@ class Relatorios:
                 - total_usuarios: número total de usuários
                 - emprestimos_ativos: número de empréstimos ativos
                 - taxa_ocupacao: percentual de livros emprestados
+                - total_emprestimos: empréstimos de todo o histórico
+                - emprestimos_arquivados: empréstimos guardados em segmentos
         """
         # Uso de list comprehension (característica funcional)
-        total_livros = len(self.sistema.livros)
+        snapshot = self.sistema.snapshot()
+        total_livros = len(snapshot.livros)
         livros_emprestados = len(
-            [livro for livro in self.sistema.livros if not livro.disponivel]
+            [livro for livro in snapshot.livros if not livro.disponivel]
         )
+        emprestimos_ativos = len(snapshot.listar_emprestimos_ativos())
+        arquivados = sum(segmento.quantidade for segmento in snapshot.segmentos)
 
         return {
             "total_livros": total_livros,
-            "total_usuarios": len(self.sistema.usuarios),
-            "emprestimos_ativos": len(self.sistema.listar_emprestimos_ativos()),
+            "total_usuarios": len(snapshot.usuarios),
+            "emprestimos_ativos": emprestimos_ativos,
             "taxa_ocupacao": (
                 (livros_emprestados / total_livros * 100) if total_livros > 0 else 0
             ),
+            "total_emprestimos": len(snapshot.emprestimos) + arquivados,
+            "emprestimos_arquivados": arquivados,
         }
 
     def historico_emprestimos(self) -> List[Emprestimo]:
-        """Retorna histórico completo de empréstimos ordenado por data.
+        """Retorna histórico de empréstimos em memória ordenado por data.
+
+        Empréstimos já arquivados em segmentos não são incluídos; use
+        historico_arquivado() para percorrê-los.
 
         Returns:
             List[Emprestimo]: Lista de empréstimos ordenada por data_emprestimo
@@ -82,5 +130,60 @@ class Relatorios:
         """
         # Exemplo de transformação funcional com sorted e lambda
         return sorted(
-            self.sistema.emprestimos, key=lambda x: x.data_emprestimo, reverse=True
+            self.sistema.snapshot().emprestimos,
+            key=lambda x: x.data_emprestimo,
+            reverse=True,
+        )
+
+    def historico_arquivado(self) -> Iterator[Dict[str, Any]]:
+        """Percorre sob demanda os empréstimos guardados em segmentos.
+
+        Os segmentos são lidos um de cada vez, do período mais recente para o
+        mais antigo, e dentro de cada um os empréstimos vêm do mais recente
+        para o mais antigo. Segmentos de arquivamentos diferentes podem cobrir
+        períodos sobrepostos, então a ordem global é apenas aproximada.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Empréstimos no formato da exportação JSONL
+        """
+        segmentos = sorted(
+            self.sistema.snapshot().segmentos,
+            key=lambda segmento: segmento.data_fim,
+            reverse=True,
+        )
+        for segmento in segmentos:
+            yield from sorted(
+                ler_segmento(segmento),
+                key=lambda registro: registro["data_emprestimo"],
+                reverse=True,
+            )
+
+    def emprestimos_no_periodo(self, inicio: datetime, fim: datetime) -> int:
+        """Conta os empréstimos realizados entre `inicio` e `fim` (inclusive).
+
+        Segmentos totalmente dentro do período entram pelo resumo e segmentos
+        fora dele são ignorados; só os que cruzam os limites são descompactados.
+
+        Args:
+            inicio: Início do período
+            fim: Fim do período
+
+        Returns:
+            int: Quantidade de empréstimos no período, incluindo os arquivados
+        """
+        snapshot = self.sistema.snapshot()
+        total = sum(
+            1 for emp in snapshot.emprestimos if inicio <= emp.data_emprestimo <= fim
         )
+        for segmento in snapshot.segmentos:
+            if segmento.data_fim < inicio or segmento.data_inicio > fim:
+                continue
+            if inicio <= segmento.data_inicio and segmento.data_fim <= fim:
+                total += segmento.quantidade
+                continue
+            total += sum(
+                1
+                for registro in ler_segmento(segmento)
+                if inicio <= datetime.fromisoformat(registro["data_emprestimo"]) <= fim
+            )
+        return total
@@ -1,9 +1,14 @@
 """Módulo do sistema de biblioteca que implementa o paradigma imperativo."""
 
+import os
+import threading
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import AbstractSet, List, Optional, Set, Tuple
 
-from biblioteca.models import Emprestimo, Livro, Usuario
+from biblioteca.isbn import normalizar_isbn
+from biblioteca.models import Emprestimo, Livro, ResumoSegmento, Usuario
+from biblioteca.versionamento import TabelaVersionada, VisaoTabela
 
 # ===== PARADIGMA IMPERATIVO =====
 # Este arquivo demonstra o paradigma imperativo através de:
@@ -13,36 +18,141 @@ from biblioteca.models import Emprestimo, Livro, Usuario
 # - Comandos que alteram o estado do programa
 
 
+@dataclass(frozen=True)
+class SnapshotSistema:
+    """Visão imutável do sistema em um instante, usada por relatórios.
+
+    Livros, usuários e empréstimos são entidades imutáveis: o sistema grava
+    cada alteração como uma nova versão, então tudo o que um snapshot expõe
+    (inclusive `disponivel` e `emprestimos_ativos`) reflete o mesmo instante.
+    A exceção são as referências internas de um empréstimo (`livro` e
+    `usuario`), que apontam para a versão vigente quando ele foi criado;
+    o usuário guarda apenas os IDs dos seus empréstimos ativos, então essas
+    versões não formam uma cadeia que prenda empréstimos antigos na memória.
+    """
+
+    versao: int
+    livros: VisaoTabela[Livro]
+    usuarios: VisaoTabela[Usuario]
+    emprestimos: VisaoTabela[Emprestimo]
+    segmentos: Tuple[ResumoSegmento, ...] = ()
+
+    def snapshot(self) -> "SnapshotSistema":
+        """Retorna o próprio snapshot, que já é imutável."""
+        return self
+
+    def listar_emprestimos_ativos(self) -> List[Emprestimo]:
+        """Lista os empréstimos que estavam ativos no instante do snapshot.
+
+        Returns:
+            List[Emprestimo]: Empréstimos sem data de devolução
+        """
+        return [e for e in self.emprestimos if not e.data_devolucao]
+
+
 class SistemaBiblioteca:
     """Classe que representa o sistema de biblioteca."""
 
     def __init__(self) -> None:
         """Inicializa o sistema de biblioteca com listas vazias e IDs iniciais."""
-        # Estado do sistema mantido em variáveis (característica imperativa)
-        self.livros: List[Livro] = []
-        self.usuarios: List[Usuario] = []
-        self.emprestimos: List[Emprestimo] = []
+        # Estado do sistema mantido em variáveis (característica imperativa).
+        # As tabelas são indexadas pela chave de cada entidade (ISBN-13
+        # canônico, ID do usuário, ID do empréstimo): busca e unicidade em O(1)
+        self.livros: TabelaVersionada[str, Livro] = TabelaVersionada()
+        self.usuarios: TabelaVersionada[int, Usuario] = TabelaVersionada()
+        self.emprestimos: TabelaVersionada[int, Emprestimo] = TabelaVersionada()
+        # Empréstimos antigos já movidos para segmentos compactados
+        self.segmentos: List[ResumoSegmento] = []
+        self._caminhos_segmentos: Set[str] = set()
         self.proximo_id_usuario = 1
         self.proximo_id_emprestimo = 1
+        # Serializa as escritas; leituras longas usam snapshot() sem bloquear
+        self._trava = threading.Lock()
+        self.versao = 0
+        self._ultimo_snapshot: Optional[SnapshotSistema] = None
+
+    def snapshot(self) -> SnapshotSistema:
+        """Captura uma visão consistente do sistema para leitura.
+
+        A trava é mantida apenas para copiar as referências aos blocos das
+        tabelas (O(n / TAMANHO_BLOCO)); se nada mudou desde o último snapshot,
+        ele é reaproveitado. Relatórios longos sobre o snapshot não bloqueiam
+        empréstimos e devoluções, nem enxergam operações aplicadas pela metade.
+
+        Returns:
+            SnapshotSistema: Estado do sistema no instante da chamada
+        """
+        with self._trava:
+            if self._ultimo_snapshot and self._ultimo_snapshot.versao == self.versao:
+                return self._ultimo_snapshot
+            self._ultimo_snapshot = SnapshotSistema(
+                versao=self.versao,
+                livros=self.livros.visao(),
+                usuarios=self.usuarios.visao(),
+                emprestimos=self.emprestimos.visao(),
+                segmentos=tuple(self.segmentos),
+            )
+            return self._ultimo_snapshot
+
+    def registrar_segmento(
+        self, resumo: ResumoSegmento, ids_arquivados: AbstractSet[int]
+    ) -> bool:
+        """Registra um segmento e retira da memória os empréstimos arquivados.
+
+        As duas alterações acontecem sob a mesma trava, então nenhum snapshot
+        conta um empréstimo em dobro (na memória e no segmento) nem o perde.
+        O custo é proporcional ao tamanho do segmento, não ao do histórico.
+
+        Args:
+            resumo: Resumo do segmento já gravado em disco
+            ids_arquivados: IDs dos empréstimos contidos no segmento
+
+        Returns:
+            bool: True se o segmento foi registrado, False se já estava
+        """
+        with self._trava:
+            caminho = os.path.abspath(resumo.caminho)
+            if caminho in self._caminhos_segmentos:
+                return False
+            for id_emprestimo in ids_arquivados:
+                self.emprestimos.remover(id_emprestimo)
+            self.segmentos.append(resumo)
+            self._caminhos_segmentos.add(caminho)
+            self.versao += 1
+            # O snapshot em cache ainda referencia os empréstimos arquivados;
+            # descartá-lo permite que eles sejam liberados da memória
+            self._ultimo_snapshot = None
+        return True
 
     # Métodos imperativos que modificam o estado do sistema
     def adicionar_livro(
         self, titulo: str, autor: str, ano: int, isbn: str, categoria: str
-    ) -> Livro:
+    ) -> Optional[Livro]:
         """Adiciona um novo livro ao sistema.
 
+        O ISBN é validado e armazenado na forma canônica ISBN-13.
+
         Args:
             titulo: Título do livro
             autor: Nome do autor
             ano: Ano de publicação
-            isbn: ISBN do livro
+            isbn: ISBN-10 ou ISBN-13 do livro, com ou sem hífens
             categoria: Categoria do livro
 
         Returns:
-            Livro: O objeto livro criado e adicionado ao sistema
+            Optional[Livro]: O objeto livro criado e adicionado ao sistema ou None
+                se o ISBN for inválido ou já estiver cadastrado
         """
-        livro = Livro(titulo, autor, ano, isbn, categoria)
-        self.livros.append(livro)  # Modificação direta do estado
+        isbn_canonico = normalizar_isbn(isbn)
+        if isbn_canonico is None:
+            return None
+
+        with self._trava:
+            if isbn_canonico in self.livros:
+                return None
+            livro = Livro(titulo, autor, ano, isbn_canonico, categoria)
+            self.livros.definir(isbn_canonico, livro)  # Modificação do estado
+            self.versao += 1
         return livro
 
     def buscar_livros(self, termo: str) -> List[Livro]:
@@ -54,25 +164,36 @@ class SistemaBiblioteca:
         Returns:
             List[Livro]: Lista de livros que correspondem ao critério de busca
         """
+        # Um ISBN completo (10 ou 13 dígitos) é resolvido pelo índice, já que
+        # o ISBN-10 digitado não aparece no ISBN-13 armazenado
+        isbn_canonico = normalizar_isbn(termo)
+        exato = self.livros.obter(isbn_canonico) if isbn_canonico else None
+
         termo = termo.lower()
+        # ISBNs são armazenados sem hífens, então o termo é limpo da mesma forma
+        termo_isbn = termo.replace("-", "").replace(" ", "")
         return [
             livro
-            for livro in self.livros
-            if termo in livro.titulo.lower()
+            for livro in self.snapshot().livros
+            if livro is exato
+            or termo in livro.titulo.lower()
             or termo in livro.autor.lower()
-            or termo in livro.isbn.lower()
+            or (termo_isbn and termo_isbn in livro.isbn.lower())
         ]
 
     def buscar_livro_por_isbn(self, isbn: str) -> Optional[Livro]:
         """Busca um livro pelo seu ISBN.
 
         Args:
-            isbn: ISBN do livro
+            isbn: ISBN-10 ou ISBN-13 do livro, com ou sem hífens
 
         Returns:
             Optional[Livro]: O livro encontrado ou None se não existir
         """
-        return next((livro for livro in self.livros if livro.isbn == isbn), None)
+        isbn_canonico = normalizar_isbn(isbn)
+        if isbn_canonico is None:
+            return None
+        return self.livros.obter(isbn_canonico)
 
     def atualizar_livro(
         self, isbn: str, titulo: Optional[str] = None, autor: Optional[str] = None
@@ -87,13 +208,16 @@ class SistemaBiblioteca:
         Returns:
             bool: True se o livro foi atualizado com sucesso, False caso contrário
         """
-        livro = self.buscar_livro_por_isbn(isbn)
-        if livro:
-            if titulo:
-                livro.titulo = titulo
-            if autor:
-                livro.autor = autor
-            return True
+        with self._trava:
+            livro = self.buscar_livro_por_isbn(isbn)
+            if livro:
+                # Nova versão do livro; snapshots anteriores mantêm a antiga
+                livro = replace(
+                    livro, titulo=titulo or livro.titulo, autor=autor or livro.autor
+                )
+                self.livros.definir(livro.isbn, livro)
+                self.versao += 1
+                return True
         return False
 
     def remover_livro(self, isbn: str) -> bool:
@@ -105,10 +229,12 @@ class SistemaBiblioteca:
         Returns:
             bool: True se o livro foi removido com sucesso, False caso contrário
         """
-        livro = self.buscar_livro_por_isbn(isbn)
-        if livro and livro.disponivel:
-            self.livros.remove(livro)
-            return True
+        with self._trava:
+            livro = self.buscar_livro_por_isbn(isbn)
+            if livro and livro.disponivel:
+                self.livros.remover(livro.isbn)
+                self.versao += 1
+                return True
         return False
 
     def listar_livros(self) -> List[Livro]:
@@ -117,7 +243,7 @@ class SistemaBiblioteca:
         Returns:
             List[Livro]: Lista com todos os livros do sistema
         """
-        return self.livros
+        return list(self.snapshot().livros)
 
     # Métodos para gerenciamento de usuários
     def cadastrar_usuario(self, nome: str, email: str, telefone: str) -> Usuario:
@@ -131,9 +257,11 @@ class SistemaBiblioteca:
         Returns:
             Usuario: O objeto usuário criado e cadastrado no sistema
         """
-        usuario = Usuario(self.proximo_id_usuario, nome, email, telefone)
-        self.usuarios.append(usuario)
-        self.proximo_id_usuario += 1
+        with self._trava:
+            usuario = Usuario(self.proximo_id_usuario, nome, email, telefone)
+            self.usuarios.definir(usuario.id, usuario)
+            self.proximo_id_usuario += 1
+            self.versao += 1
         return usuario
 
     def buscar_usuarios(self, termo: str) -> List[Usuario]:
@@ -148,7 +276,7 @@ class SistemaBiblioteca:
         termo = termo.lower()
         return [
             u
-            for u in self.usuarios
+            for u in self.snapshot().usuarios
             if termo in u.nome.lower() or termo in u.email.lower()
         ]
 
@@ -161,7 +289,7 @@ class SistemaBiblioteca:
         Returns:
             Optional[Usuario]: O usuário encontrado ou None se não existir
         """
-        return next((u for u in self.usuarios if u.id == id_usuario), None)
+        return self.usuarios.obter(id_usuario)
 
     def atualizar_usuario(
         self,
@@ -181,15 +309,18 @@ class SistemaBiblioteca:
         Returns:
             bool: True se o usuário foi atualizado com sucesso, False caso contrário
         """
-        usuario = self.buscar_usuario_por_id(id_usuario)
-        if usuario:
-            if nome:
-                usuario.nome = nome
-            if email:
-                usuario.email = email
-            if telefone:
-                usuario.telefone = telefone
-            return True
+        with self._trava:
+            usuario = self.buscar_usuario_por_id(id_usuario)
+            if usuario:
+                usuario = replace(
+                    usuario,
+                    nome=nome or usuario.nome,
+                    email=email or usuario.email,
+                    telefone=telefone or usuario.telefone,
+                )
+                self.usuarios.definir(usuario.id, usuario)
+                self.versao += 1
+                return True
         return False
 
     def remover_usuario(self, id_usuario: int) -> bool:
@@ -201,10 +332,12 @@ class SistemaBiblioteca:
         Returns:
             bool: True se o usuário foi removido com sucesso, False caso contrário
         """
-        usuario = self.buscar_usuario_por_id(id_usuario)
-        if usuario and not usuario.emprestimos_ativos:
-            self.usuarios.remove(usuario)
-            return True
+        with self._trava:
+            usuario = self.buscar_usuario_por_id(id_usuario)
+            if usuario and not usuario.emprestimos_ativos:
+                self.usuarios.remover(usuario.id)
+                self.versao += 1
+                return True
         return False
 
     def listar_usuarios(self) -> List[Usuario]:
@@ -213,7 +346,7 @@ class SistemaBiblioteca:
         Returns:
             List[Usuario]: Lista com todos os usuários do sistema
         """
-        return self.usuarios
+        return list(self.snapshot().usuarios)
 
     # Métodos para gerenciamento de empréstimos
     def realizar_emprestimo(self, id_usuario: int, isbn: str, dias: int) -> bool:
@@ -227,29 +360,37 @@ class SistemaBiblioteca:
         Returns:
             bool: True se o empréstimo foi realizado com sucesso, False caso contrário
         """
-        # Exemplo de controle de fluxo imperativo
-        usuario = self.buscar_usuario_por_id(id_usuario)
-        livro = self.buscar_livro_por_isbn(isbn)
-
-        if not usuario or not livro or not livro.disponivel:
-            return False
-
-        if len(usuario.emprestimos_ativos) >= 3:
-            return False
-
-        # Sequência de operações que modificam o estado
-        emprestimo = Emprestimo(
-            id=self.proximo_id_emprestimo,
-            usuario=usuario,
-            livro=livro,
-            data_emprestimo=datetime.now(),
-            data_prevista_devolucao=datetime.now() + timedelta(days=dias),
-        )
-
-        self.emprestimos.append(emprestimo)
-        usuario.emprestimos_ativos.append(emprestimo)
-        livro.disponivel = False
-        self.proximo_id_emprestimo += 1
+        with self._trava:
+            # Exemplo de controle de fluxo imperativo
+            usuario = self.buscar_usuario_por_id(id_usuario)
+            livro = self.buscar_livro_por_isbn(isbn)
+
+            if not usuario or not livro or not livro.disponivel:
+                return False
+
+            if len(usuario.emprestimos_ativos) >= 3:
+                return False
+
+            # Sequência de operações que modificam o estado; cada entidade
+            # alterada é gravada como nova versão (cópia na escrita)
+            livro = replace(livro, disponivel=False)
+            emprestimo = Emprestimo(
+                id=self.proximo_id_emprestimo,
+                usuario=usuario,
+                livro=livro,
+                data_emprestimo=datetime.now(),
+                data_prevista_devolucao=datetime.now() + timedelta(days=dias),
+            )
+            usuario = replace(
+                usuario,
+                emprestimos_ativos=usuario.emprestimos_ativos + (emprestimo.id,),
+            )
+
+            self.emprestimos.definir(emprestimo.id, emprestimo)
+            self.usuarios.definir(usuario.id, usuario)
+            self.livros.definir(livro.isbn, livro)
+            self.proximo_id_emprestimo += 1
+            self.versao += 1
 
         return True
 
@@ -262,20 +403,28 @@ class SistemaBiblioteca:
         Returns:
             bool: True se a devolução foi realizada com sucesso, False caso contrário
         """
-        emprestimo = next(
-            (
-                e
-                for e in self.emprestimos
-                if e.id == id_emprestimo and not e.data_devolucao
-            ),
-            None,
-        )
-        if not emprestimo:
-            return False
-
-        emprestimo.data_devolucao = datetime.now()
-        emprestimo.livro.disponivel = True
-        emprestimo.usuario.emprestimos_ativos.remove(emprestimo)
+        with self._trava:
+            emprestimo = self.emprestimos.obter(id_emprestimo)
+            if not emprestimo or emprestimo.data_devolucao:
+                return False
+
+            # Cópia na escrita: snapshots antigos continuam vendo o empréstimo
+            # em andamento, o livro emprestado e o usuário com o empréstimo
+            self.emprestimos.definir(
+                emprestimo.id, replace(emprestimo, data_devolucao=datetime.now())
+            )
+            livro = self.livros.obter(emprestimo.livro.isbn)
+            if livro:
+                self.livros.definir(livro.isbn, replace(livro, disponivel=True))
+            usuario = self.usuarios.obter(emprestimo.usuario.id)
+            if usuario:
+                ativos = tuple(
+                    i for i in usuario.emprestimos_ativos if i != emprestimo.id
+                )
+                self.usuarios.definir(
+                    usuario.id, replace(usuario, emprestimos_ativos=ativos)
+                )
+            self.versao += 1
 
         return True
 
@@ -285,7 +434,7 @@ class SistemaBiblioteca:
         Returns:
             List[Emprestimo]: Lista de empréstimos que ainda não foram devolvidos
         """
-        return [e for e in self.emprestimos if not e.data_devolucao]
+        return self.snapshot().listar_emprestimos_ativos()
 
     def verificar_atrasos(self) -> List[Emprestimo]:
         """Verifica todos os empréstimos ativos que estão em atraso.
@@ -293,6 +442,9 @@ class SistemaBiblioteca:
         Returns:
             List[Emprestimo]: Lista de empréstimos ativos que estão em atraso
         """
+        agora = datetime.now()
         return [
-            e for e in self.emprestimos if not e.data_devolucao and e.esta_atrasado()
+            e
+            for e in self.snapshot().emprestimos
+            if not e.data_devolucao and e.esta_atrasado(agora)
         ]
@@ -0,0 +1,136 @@
+"""Módulo de tabelas versionadas com cópia na escrita por blocos."""
+
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+# ===== CÓPIA NA ESCRITA (COPY-ON-WRITE) =====
+# Os registros ficam distribuídos em blocos de tamanho limitado. Uma visão
+# guarda apenas as referências aos blocos existentes; depois dela, o primeiro
+# escritor que alterar um bloco compartilhado trabalha sobre uma cópia desse
+# bloco. Assim, capturar uma visão custa O(n / tamanho_bloco) e cada escrita
+# copia no máximo um bloco, em vez de toda a coleção.
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+TAMANHO_BLOCO = 1024
+
+
+class VisaoTabela(Generic[V]):
+    """Visão imutável dos valores de uma tabela em um instante."""
+
+    __slots__ = ("_blocos", "_tamanho")
+
+    def __init__(self, blocos: Tuple[Mapping[Any, V], ...], tamanho: int) -> None:
+        """Inicializa a visão com blocos que não serão mais alterados."""
+        self._blocos = blocos
+        self._tamanho = tamanho
+
+    def __iter__(self) -> Iterator[V]:
+        """Percorre os valores na ordem de inserção."""
+        for bloco in self._blocos:
+            yield from bloco.values()
+
+    def __len__(self) -> int:
+        """Quantidade de valores na visão."""
+        return self._tamanho
+
+
+class TabelaVersionada(Generic[K, V]):
+    """Tabela chave -> valor que permite visões baratas e consistentes.
+
+    Não é segura para vários escritores simultâneos: quem a usa deve
+    serializar as escritas e a captura de visões (SistemaBiblioteca usa
+    a sua trava para isso). Leituras feitas sobre uma visão não precisam
+    de trava.
+    """
+
+    def __init__(self, tamanho_bloco: int = TAMANHO_BLOCO) -> None:
+        """Inicializa uma tabela vazia.
+
+        Args:
+            tamanho_bloco: Quantidade máxima de registros por bloco
+        """
+        self._tamanho_bloco = tamanho_bloco
+        self._blocos: Dict[int, Dict[K, V]] = {}
+        # Geração em que cada bloco foi criado ou copiado; um bloco só pode
+        # ser alterado no lugar se ainda não foi entregue a uma visão
+        self._geracao_bloco: Dict[int, int] = {}
+        self._bloco_da_chave: Dict[K, int] = {}
+        self._geracao = 0
+        self._bloco_atual = -1
+
+    def __len__(self) -> int:
+        """Quantidade de registros na tabela."""
+        return len(self._bloco_da_chave)
+
+    def __contains__(self, chave: object) -> bool:
+        """Verifica se a chave está na tabela."""
+        return chave in self._bloco_da_chave
+
+    def obter(self, chave: K) -> Optional[V]:
+        """Retorna o valor atual da chave ou None se ela não existir.
+
+        Pode ser chamado sem a trava dos escritores: se o registro for
+        removido (e seu bloco descartado) entre as duas consultas, o
+        resultado é None, como se a leitura tivesse ocorrido após a remoção.
+        """
+        numero = self._bloco_da_chave.get(chave)
+        if numero is None:
+            return None
+        bloco = self._blocos.get(numero)
+        return None if bloco is None else bloco.get(chave)
+
+    def _gravavel(self, numero: int) -> Dict[K, V]:
+        """Retorna o bloco pronto para escrita, copiando-o se compartilhado."""
+        if self._geracao_bloco[numero] != self._geracao:
+            self._blocos[numero] = dict(self._blocos[numero])
+            self._geracao_bloco[numero] = self._geracao
+        return self._blocos[numero]
+
+    def definir(self, chave: K, valor: V) -> None:
+        """Insere um novo registro ou substitui a versão atual de um existente."""
+        numero = self._bloco_da_chave.get(chave)
+        if numero is None:
+            bloco = self._blocos.get(self._bloco_atual)
+            if bloco is None or len(bloco) >= self._tamanho_bloco:
+                self._bloco_atual += 1
+                self._blocos[self._bloco_atual] = {}
+                self._geracao_bloco[self._bloco_atual] = self._geracao
+            numero = self._bloco_atual
+            self._bloco_da_chave[chave] = numero
+        self._gravavel(numero)[chave] = valor
+
+    def remover(self, chave: K) -> Optional[V]:
+        """Remove um registro, devolvendo o valor removido ou None."""
+        numero = self._bloco_da_chave.pop(chave, None)
+        if numero is None:
+            return None
+        bloco = self._gravavel(numero)
+        valor = bloco.pop(chave)
+        # Blocos antigos esvaziados (ex.: após arquivamento) são descartados
+        # para que as visões não precisem percorrê-los
+        if not bloco and numero != self._bloco_atual:
+            del self._blocos[numero]
+            del self._geracao_bloco[numero]
+        return valor
+
+    def visao(self) -> VisaoTabela[V]:
+        """Captura uma visão imutável dos valores atuais.
+
+        Returns:
+            VisaoTabela[V]: Visão que não muda com escritas posteriores
+        """
+        blocos = tuple(self._blocos.values())
+        # Todos os blocos atuais passam a ser compartilhados com a visão
+        self._geracao += 1
+        return VisaoTabela(blocos, len(self._bloco_da_chave))
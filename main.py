@@ -1,5 +1,9 @@
 """Módulo principal do sistema de biblioteca."""
 
+from datetime import timedelta
+
+from biblioteca.arquivamento import arquivar_emprestimos
+from biblioteca.exportacao import exportar_sistema
 from biblioteca.relatorios import Relatorios
 from biblioteca.sistema import SistemaBiblioteca
 
@@ -50,8 +54,10 @@ def menu_livros(sistema: SistemaBiblioteca) -> None:
             ano = int(input("Ano: "))
             isbn = input("ISBN: ")
             categoria = input("Categoria: ")
-            sistema.adicionar_livro(titulo, autor, ano, isbn, categoria)
-            print("Livro adicionado com sucesso!")
+            if sistema.adicionar_livro(titulo, autor, ano, isbn, categoria):
+                print("Livro adicionado com sucesso!")
+            else:
+                print("ISBN inválido ou já cadastrado!")
 
         elif opcao == "2":
             termo = input("Digite o termo de busca: ")
@@ -214,7 +220,10 @@ def menu_relatorios(sistema: SistemaBiblioteca) -> None:
         print("1. Livros Mais Emprestados")
         print("2. Usuários Mais Ativos")
         print("3. Estatísticas Gerais")
-        print("4. Histórico de Empréstimos")
+        print("4. Histórico de Empréstimos (em memória)")
+        print("5. Exportar Dados (CSV/JSONL)")
+        print("6. Arquivar Empréstimos Antigos")
+        print("7. Histórico de Empréstimos Arquivados")
         print("0. Voltar")
 
         opcao = input("Escolha uma opção: ")
@@ -236,12 +245,46 @@ def menu_relatorios(sistema: SistemaBiblioteca) -> None:
             print(f"Total de usuários: {stats['total_usuarios']}")
             print(f"Empréstimos ativos: {stats['emprestimos_ativos']}")
             print(f"Taxa de ocupação: {stats['taxa_ocupacao']:.2f}%")
+            print(f"Total de empréstimos: {stats['total_emprestimos']}")
+            print(f"Empréstimos arquivados: {stats['emprestimos_arquivados']}")
 
         elif opcao == "4":
-            print("\nHistórico de Empréstimos:")
+            print("\nHistórico de Empréstimos (em memória):")
             for emp in relatorios.historico_emprestimos():
                 print(f"\n{emp}")
 
+        elif opcao == "5":
+            diretorio = input("Diretório de destino: ")
+            formato = input("Formato (csv/jsonl): ").strip().lower()
+            comprimir = input("Compactar com gzip? (s/n): ").strip().lower() == "s"
+            if formato not in ("csv", "jsonl"):
+                print("Formato inválido!")
+                continue
+            for resultado in exportar_sistema(sistema, diretorio, formato, comprimir):
+                print(
+                    f"{resultado.caminho}: {resultado.registros} registros "
+                    f"({resultado.registros_por_segundo:.0f} registros/s)"
+                )
+
+        elif opcao == "6":
+            diretorio = input("Diretório dos segmentos: ")
+            dias = int(input("Arquivar devoluções com mais de quantos dias? "))
+            resumos = arquivar_emprestimos(sistema, diretorio, timedelta(days=dias))
+            for resumo in resumos:
+                print(f"{resumo.quantidade} empréstimos arquivados em {resumo.caminho}")
+            if not resumos:
+                print("Não há empréstimos para arquivar!")
+
+        elif opcao == "7":
+            print("\nHistórico de Empréstimos Arquivados:")
+            for registro in relatorios.historico_arquivado():
+                print(
+                    f"ID: {registro['id']} | ISBN: {registro['isbn']} | "
+                    f"Usuário: {registro['id_usuario']} | "
+                    f"Empréstimo: {registro['data_emprestimo'][:10]} | "
+                    f"Devolução: {(registro['data_devolucao'] or '')[:10]}"
+                )
+
         elif opcao == "0":
             break
 
@@ -256,11 +299,11 @@ def main() -> None:
         "Dom Casmurro",
         "Machado de Assis",
         1899,
-        "9788535910682",
+        "9788535910681",
         "Literatura Brasileira",
     )
     sistema.adicionar_livro(
-        "O Cortiço", "Aluísio Azevedo", 1890, "9788535910699", "Literatura Brasileira"
+        "O Cortiço", "Aluísio Azevedo", 1890, "9788535910698", "Literatura Brasileira"
     )
     sistema.cadastrar_usuario("João Silva", "joao@email.com", "11999999999")
     sistema.cadastrar_usuario("Maria Santos", "maria@email.com", "11988888888")
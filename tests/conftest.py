@@ -0,0 +1,53 @@
+"""Fixtures compartilhadas pelos testes do sistema de biblioteca."""
+
+from typing import Callable
+
+import pytest
+
+from biblioteca.carga import _isbn_sintetico
+from biblioteca.sistema import SistemaBiblioteca
+
+GeradorIsbn = Callable[[int], str]
+FabricaSistema = Callable[..., SistemaBiblioteca]
+
+
+@pytest.fixture
+def gerar_isbn() -> GeradorIsbn:
+    """Função que gera um ISBN-13 válido a partir de um número."""
+    return _isbn_sintetico
+
+
+@pytest.fixture
+def isbn_a(gerar_isbn: GeradorIsbn) -> str:
+    """ISBN do primeiro livro do sistema de teste."""
+    return gerar_isbn(0)
+
+
+@pytest.fixture
+def isbn_b(gerar_isbn: GeradorIsbn) -> str:
+    """ISBN do segundo livro do sistema de teste."""
+    return gerar_isbn(1)
+
+
+@pytest.fixture
+def criar_sistema(gerar_isbn: GeradorIsbn) -> FabricaSistema:
+    """Fábrica de sistemas com `livros` livros e `usuarios` usuários.
+
+    O livro i recebe o ISBN gerar_isbn(i) e o usuário i recebe o ID i + 1.
+    """
+
+    def criar(livros: int = 0, usuarios: int = 0) -> SistemaBiblioteca:
+        sistema = SistemaBiblioteca()
+        for i in range(livros):
+            sistema.adicionar_livro(f"Livro {i}", "Autor", 2000, gerar_isbn(i), "Geral")
+        for i in range(usuarios):
+            sistema.cadastrar_usuario(f"Usuário {i}", f"u{i}@email.com", "11900000000")
+        return sistema
+
+    return criar
+
+
+@pytest.fixture
+def sistema(criar_sistema: FabricaSistema) -> SistemaBiblioteca:
+    """Sistema com dois livros (isbn_a e isbn_b) e um usuário (ID 1)."""
+    return criar_sistema(livros=2, usuarios=1)
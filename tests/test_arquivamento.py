@@ -0,0 +1,109 @@
+"""Testes do arquivamento de empréstimos em segmentos compactados."""
+
+import gc
+import os
+import weakref
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from biblioteca.arquivamento import (
+    TAMANHO_MAXIMO_SEGMENTO,
+    arquivar_emprestimos,
+    carregar_segmentos,
+)
+from biblioteca.models import ResumoSegmento
+from biblioteca.relatorios import Relatorios
+from biblioteca.sistema import SistemaBiblioteca
+
+
+def _devolver_emprestimos(
+    sistema: SistemaBiblioteca, quantidade: int
+) -> SistemaBiblioteca:
+    """Faz `quantidade` empréstimos já devolvidos, alternando os dois livros."""
+    isbns = [livro.isbn for livro in sistema.listar_livros()]
+    inicial = sistema.proximo_id_emprestimo
+    for i in range(quantidade):
+        sistema.realizar_emprestimo(1, isbns[i % 2], 7)
+        sistema.realizar_devolucao(inicial + i)
+    return sistema
+
+
+def _arquivar_tudo(
+    sistema: SistemaBiblioteca,
+    diretorio: Path,
+    tamanho_maximo: int = TAMANHO_MAXIMO_SEGMENTO,
+) -> List[ResumoSegmento]:
+    """Arquiva todos os empréstimos devolvidos até agora."""
+    return arquivar_emprestimos(
+        sistema,
+        str(diretorio),
+        timedelta(0),
+        agora=datetime.now() + timedelta(seconds=1),
+        tamanho_maximo=tamanho_maximo,
+    )
+
+
+def test_relatorios_mantem_totais_apos_arquivamento(
+    tmp_path: Path, sistema: SistemaBiblioteca
+) -> None:
+    """Totais do histórico combinam memória e resumos dos segmentos."""
+    _devolver_emprestimos(sistema, 5)
+    relatorios = Relatorios(sistema)
+    antes = [(livro.isbn, n) for livro, n in relatorios.livros_mais_emprestados()]
+
+    resumos = _arquivar_tudo(sistema, tmp_path, tamanho_maximo=2)
+
+    assert [r.quantidade for r in resumos] == [2, 2, 1]
+    assert len(sistema.snapshot().emprestimos) == 0
+    depois = [(livro.isbn, n) for livro, n in relatorios.livros_mais_emprestados()]
+    assert depois == antes
+    assert relatorios.estatisticas_gerais()["total_emprestimos"] == 5
+    assert sorted(r["id"] for r in relatorios.historico_arquivado()) == [1, 2, 3, 4, 5]
+
+
+def test_carregar_segmentos_e_idempotente(
+    tmp_path: Path, sistema: SistemaBiblioteca
+) -> None:
+    """Carregar o mesmo diretório duas vezes não duplica o histórico."""
+    _arquivar_tudo(_devolver_emprestimos(sistema, 3), tmp_path)
+    novo = SistemaBiblioteca()
+
+    assert len(carregar_segmentos(novo, str(tmp_path))) == 1
+    assert carregar_segmentos(novo, str(tmp_path)) == []
+    assert Relatorios(novo).estatisticas_gerais()["emprestimos_arquivados"] == 3
+
+
+def test_segmento_orfao_nao_bloqueia_arquivamento(
+    tmp_path: Path, sistema: SistemaBiblioteca
+) -> None:
+    """Dados sem resumo (falha anterior) não fazem o número se repetir."""
+    _arquivar_tudo(_devolver_emprestimos(sistema, 2), tmp_path)
+    os.chmod(tmp_path / "segmento-000001.json", 0o644)
+    os.remove(tmp_path / "segmento-000001.json")
+
+    resumos = _arquivar_tudo(_devolver_emprestimos(sistema, 2), tmp_path)
+
+    assert os.path.basename(resumos[0].caminho) == "segmento-000002.jsonl.gz"
+    assert not [nome for nome in os.listdir(tmp_path) if nome.endswith(".tmp")]
+
+
+def test_arquivamento_libera_emprestimos_da_memoria(
+    tmp_path: Path, sistema: SistemaBiblioteca, isbn_a: str, isbn_b: str
+) -> None:
+    """Empréstimos arquivados deixam de ser alcançáveis a partir do sistema."""
+    # Empréstimos sobrepostos: o usuário nunca fica sem livro em mãos
+    assert sistema.realizar_emprestimo(1, isbn_a, 7)
+    for passo in range(1, 200):
+        assert sistema.realizar_emprestimo(1, [isbn_a, isbn_b][passo % 2], 7)
+        assert sistema.realizar_devolucao(passo)
+    arquivados = [
+        weakref.ref(e) for e in sistema.snapshot().emprestimos if e.data_devolucao
+    ]
+
+    _arquivar_tudo(sistema, tmp_path, tamanho_maximo=50)
+    gc.collect()
+
+    assert len(arquivados) == 199
+    assert [ref for ref in arquivados if ref() is not None] == []
+    assert len(sistema.snapshot().emprestimos) == 1
@@ -0,0 +1,110 @@
+"""Testes da gravação e reprodução de carga."""
+
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from biblioteca.arquivamento import arquivar_emprestimos
+from biblioteca.carga import (
+    Chamada,
+    GravadorCarga,
+    carregar_trace,
+    gerar_trace_dia,
+    percentil,
+    reproduzir,
+)
+from biblioteca.models import Livro
+from biblioteca.sistema import SistemaBiblioteca
+
+
+def test_gravador_registra_argumentos_nomeados(tmp_path: Path, isbn_a: str) -> None:
+    """Argumentos nomeados são gravados e repassados na reprodução."""
+    gravador = GravadorCarga(SistemaBiblioteca())
+    gravador.sistema.adicionar_livro("Dom Casmurro", "Machado", 1899, isbn_a, "Lit")
+    gravador.sistema.cadastrar_usuario("João", "joao@email.com", "11999999999")
+    assert gravador.sistema.realizar_emprestimo(id_usuario=1, isbn=isbn_a, dias=14)
+    gravador.salvar(str(tmp_path / "trace.jsonl"))
+
+    chamadas = carregar_trace(str(tmp_path / "trace.jsonl"))
+
+    assert chamadas[-1].kwargs == {"id_usuario": 1, "isbn": isbn_a, "dias": 14}
+    assert not reproduzir(chamadas, velocidade=0).divergencias
+
+
+def test_gravador_registra_chamadas_que_falham() -> None:
+    """Uma exceção é propagada e a chamada continua no trace."""
+    gravador = GravadorCarga(SistemaBiblioteca())
+
+    with pytest.raises(TypeError):
+        gravador.sistema.realizar_emprestimo(1)
+
+    assert [(c.metodo, c.erro) for c in gravador.chamadas] == [
+        ("realizar_emprestimo", "TypeError")
+    ]
+    assert not reproduzir(gravador.chamadas, velocidade=0).divergencias
+
+
+def test_gravador_consome_resultados_geradores(
+    tmp_path: Path, sistema: SistemaBiblioteca, isbn_a: str
+) -> None:
+    """Métodos que devolvem geradores são gravados como listas."""
+    sistema.realizar_emprestimo(1, isbn_a, 7)
+    sistema.realizar_devolucao(1)
+    arquivar_emprestimos(
+        sistema,
+        str(tmp_path / "segmentos"),
+        timedelta(0),
+        agora=datetime.now() + timedelta(seconds=1),
+    )
+    gravador = GravadorCarga(sistema)
+
+    historico = gravador.relatorios.historico_arquivado()
+    gravador.salvar(str(tmp_path / "trace.jsonl"))
+
+    assert [registro["id"] for registro in historico] == [1]
+    assert carregar_trace(str(tmp_path / "trace.jsonl"))[0].resultado == historico
+
+
+def test_percentil_usa_posto_mais_proximo() -> None:
+    """O percentil é o menor valor que cobre p% das amostras."""
+    assert percentil([1, 2, 3, 4, 5], 50) == 3
+    assert percentil([1, 2, 3, 4], 50) == 2
+    assert percentil([1, 2, 3, 4, 5], 100) == 5
+    assert percentil([1, 2, 3, 4, 5], 0) == 1
+
+
+def test_reproducao_concorrente_preserva_ordem_das_escritas() -> None:
+    """Escritas não divergem com várias threads; leituras ficam à parte."""
+    chamadas = gerar_trace_dia(livros=30, usuarios=10, emprestimos=60)
+
+    sequencial = reproduzir(chamadas, velocidade=0)
+    concorrente = reproduzir(chamadas, velocidade=0, concorrencia=4)
+
+    assert not sequencial.divergencias
+    assert not sequencial.divergencias_ordem
+    assert not concorrente.divergencias
+    assert concorrente.chamadas == len(chamadas)
+
+
+def test_latencia_inclui_espera_na_fila() -> None:
+    """Chamadas atrasadas pelo tráfego anterior contam o tempo de espera."""
+
+    class SistemaLento(SistemaBiblioteca):
+        def buscar_livros(self, termo: str) -> List[Livro]:
+            time.sleep(0.02)
+            return super().buscar_livros(termo)
+
+    # Dez buscas agendadas no mesmo instante: as últimas esperam as primeiras
+    chamadas = [
+        Chamada(0.0, "sistema", "buscar_livros", ["x"], resultado=[]) for _ in range(10)
+    ]
+
+    resultado = reproduzir(chamadas, velocidade=1.0, fabrica=SistemaLento)
+
+    latencias = sorted(resultado.latencias["sistema.buscar_livros"])
+    assert latencias[-1] >= 0.18
+    assert max(resultado.esperas["sistema.buscar_livros"]) >= 0.16
+    assert resultado.resumo()["espera_ms"]["p99"] >= 160
@@ -0,0 +1,65 @@
+"""Testes da exportação de dados do sistema de biblioteca."""
+
+import csv
+import gzip
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from biblioteca.arquivamento import arquivar_emprestimos
+from biblioteca.exportacao import exportar_sistema
+from biblioteca.sistema import SistemaBiblioteca
+
+
+@pytest.fixture
+def sistema_com_historico(
+    sistema: SistemaBiblioteca, isbn_a: str, isbn_b: str
+) -> SistemaBiblioteca:
+    """Sistema com um empréstimo devolvido (isbn_a) e um em andamento (isbn_b)."""
+    sistema.realizar_emprestimo(1, isbn_a, 7)
+    sistema.realizar_devolucao(1)
+    sistema.realizar_emprestimo(1, isbn_b, 7)
+    return sistema
+
+
+def test_exportacao_csv_consistente_entre_arquivos(
+    tmp_path: Path, sistema_com_historico: SistemaBiblioteca, isbn_a: str, isbn_b: str
+) -> None:
+    """Livros e usuários exportados concordam com os empréstimos ativos."""
+    sistema = sistema_com_historico
+    snapshot = sistema.snapshot()
+    # Alterações após o snapshot não podem aparecer na exportação
+    sistema.realizar_devolucao(2)
+
+    resultados = exportar_sistema(snapshot, str(tmp_path), "csv")
+
+    assert [r.registros for r in resultados] == [2, 1, 2]
+    with open(tmp_path / "livros.csv", encoding="utf-8") as arquivo:
+        livros = {linha["isbn"]: linha for linha in csv.DictReader(arquivo)}
+    with open(tmp_path / "usuarios.csv", encoding="utf-8") as arquivo:
+        usuarios = list(csv.DictReader(arquivo))
+    assert livros[isbn_a]["disponivel"] == "True"
+    assert livros[isbn_b]["disponivel"] == "False"
+    assert usuarios[0]["emprestimos_ativos"] == "1"
+
+
+def test_exportacao_jsonl_inclui_emprestimos_arquivados(
+    tmp_path: Path, sistema_com_historico: SistemaBiblioteca
+) -> None:
+    """Empréstimos movidos para segmentos continuam no arquivo exportado."""
+    sistema = sistema_com_historico
+    arquivar_emprestimos(
+        sistema,
+        str(tmp_path / "segmentos"),
+        timedelta(0),
+        agora=datetime.now() + timedelta(seconds=1),
+    )
+
+    exportar_sistema(sistema, str(tmp_path / "saida"), "jsonl", comprimir=True)
+
+    with gzip.open(tmp_path / "saida" / "emprestimos.jsonl.gz", "rt") as arquivo:
+        emprestimos = [json.loads(linha) for linha in arquivo]
+    assert [e["id"] for e in emprestimos] == [2, 1]
+    assert emprestimos[1]["data_devolucao"] is not None
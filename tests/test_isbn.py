@@ -0,0 +1,72 @@
+"""Testes da normalização e validação de ISBN."""
+
+from biblioteca.isbn import isbn10_valido, isbn13_valido, normalizar_isbn
+from biblioteca.sistema import SistemaBiblioteca
+
+# Dom Casmurro: mesma edição nas formas ISBN-10 e ISBN-13
+ISBN10 = "85-359-1068-9"
+ISBN13 = "978-85-359-1068-1"
+ISBN13_CANONICO = "9788535910681"
+
+
+def test_isbn10_convertido_para_isbn13() -> None:
+    """ISBN-10 vira ISBN-13 com prefixo 978 e novo dígito verificador."""
+    assert normalizar_isbn("8535910689") == ISBN13_CANONICO
+    assert normalizar_isbn("080442957X") == "9780804429573"
+    assert normalizar_isbn("080442957x") == "9780804429573"
+
+
+def test_hifens_e_espacos_sao_ignorados() -> None:
+    """Hífens e espaços não fazem parte da chave canônica."""
+    assert normalizar_isbn(ISBN10) == ISBN13_CANONICO
+    assert normalizar_isbn(ISBN13) == ISBN13_CANONICO
+    assert normalizar_isbn("978 85 359 1068 1") == ISBN13_CANONICO
+
+
+def test_digito_verificador_invalido_e_rejeitado() -> None:
+    """Qualquer dígito verificador errado invalida o ISBN."""
+    assert not isbn10_valido("8535910688")
+    assert not isbn10_valido("853591068X")
+    assert not isbn13_valido("9788535910682")
+    assert normalizar_isbn("978-85-359-1068-2") is None
+    assert normalizar_isbn("85-359-1068-8") is None
+    assert normalizar_isbn("") is None
+
+
+def test_ean13_sem_prefixo_de_livro_e_rejeitado() -> None:
+    """Códigos EAN-13 válidos fora de 978/979 não são ISBNs."""
+    assert not isbn13_valido("0000000000000")
+    assert not isbn13_valido("7891000315507")  # Código de barras de produto
+    assert isbn13_valido("9791032300824")
+
+
+def test_livro_duplicado_em_outra_forma_e_rejeitado() -> None:
+    """O mesmo livro não pode ser cadastrado como ISBN-10 e como ISBN-13."""
+    sistema = SistemaBiblioteca()
+    livro = sistema.adicionar_livro("Dom Casmurro", "Machado", 1899, ISBN10, "Lit")
+
+    assert livro is not None
+    assert livro.isbn == ISBN13_CANONICO
+    assert (
+        sistema.adicionar_livro("Dom Casmurro", "Machado", 1899, ISBN13, "Lit") is None
+    )
+    assert len(sistema.listar_livros()) == 1
+
+
+def test_operacoes_encontram_livro_pelas_duas_formas() -> None:
+    """Busca, atualização e remoção aceitam ISBN-10 e ISBN-13."""
+    sistema = SistemaBiblioteca()
+    sistema.adicionar_livro("Dom Casmurro", "Machado", 1899, ISBN13, "Lit")
+
+    for isbn in (ISBN10, "8535910689", ISBN13, ISBN13_CANONICO):
+        livro = sistema.buscar_livro_por_isbn(isbn)
+        assert livro is not None and livro.isbn == ISBN13_CANONICO
+        assert [livro.isbn for livro in sistema.buscar_livros(isbn)] == [
+            ISBN13_CANONICO
+        ]
+
+    assert sistema.atualizar_livro(ISBN10, titulo="Dom Casmurro (ed. revista)")
+    livro = sistema.buscar_livro_por_isbn(ISBN13)
+    assert livro is not None and livro.titulo == "Dom Casmurro (ed. revista)"
+    assert sistema.remover_livro(ISBN10)
+    assert sistema.buscar_livro_por_isbn(ISBN13) is None
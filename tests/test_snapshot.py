@@ -0,0 +1,161 @@
+"""Testes de isolamento dos snapshots do sistema de biblioteca."""
+
+import threading
+from typing import Callable, List
+
+import pytest
+
+from biblioteca.relatorios import Relatorios
+from biblioteca.sistema import SistemaBiblioteca, SnapshotSistema
+from biblioteca.versionamento import TabelaVersionada
+
+LIVROS = 40
+USUARIOS = 20
+ESCRITORES = 4
+OPERACOES_POR_ESCRITOR = 1500
+CICLOS_SOBREPOSTOS = 3000
+
+
+@pytest.fixture
+def sistema_populado(
+    criar_sistema: Callable[..., SistemaBiblioteca],
+) -> SistemaBiblioteca:
+    """Sistema com LIVROS livros e USUARIOS usuários."""
+    return criar_sistema(livros=LIVROS, usuarios=USUARIOS)
+
+
+def _verificar_consistencia(snapshot: SnapshotSistema) -> None:
+    """Confere que empréstimos, livros e usuários descrevem o mesmo instante."""
+    ativos = snapshot.listar_emprestimos_ativos()
+    emprestados = {livro.isbn for livro in snapshot.livros if not livro.disponivel}
+    assert {e.livro.isbn for e in ativos} == emprestados
+    assert len(ativos) == len(emprestados)
+    assert sum(len(u.emprestimos_ativos) for u in snapshot.usuarios) == len(ativos)
+
+    stats = Relatorios(snapshot).estatisticas_gerais()
+    assert stats["emprestimos_ativos"] == len(ativos)
+    assert stats["taxa_ocupacao"] == len(emprestados) / LIVROS * 100
+
+
+def test_snapshot_nao_ve_devolucao_posterior(
+    sistema_populado: SistemaBiblioteca, isbn_a: str
+) -> None:
+    """Uma devolução após o snapshot não altera livro nem usuário nele."""
+    sistema = sistema_populado
+    assert sistema.realizar_emprestimo(1, isbn_a, 7)
+    snapshot = sistema.snapshot()
+
+    assert sistema.realizar_devolucao(1)
+
+    assert len(snapshot.listar_emprestimos_ativos()) == 1
+    livro = next(livro for livro in snapshot.livros if livro.isbn == isbn_a)
+    assert not livro.disponivel
+    usuario = next(u for u in snapshot.usuarios if u.id == 1)
+    assert usuario.emprestimos_ativos == (1,)
+    _verificar_consistencia(snapshot)
+    _verificar_consistencia(sistema.snapshot())
+
+
+def test_emprestimos_sobrepostos_nao_encadeiam_versoes(
+    sistema: SistemaBiblioteca, isbn_a: str, isbn_b: str
+) -> None:
+    """Um usuário sempre com livro em mãos não acumula versões antigas."""
+    isbns = [isbn_a, isbn_b]
+    assert sistema.realizar_emprestimo(1, isbns[0], 7)
+    for passo in range(1, CICLOS_SOBREPOSTOS):
+        # O novo empréstimo começa antes da devolução do anterior
+        assert sistema.realizar_emprestimo(1, isbns[passo % 2], 7)
+        assert sistema.realizar_devolucao(passo)
+
+    usuario = sistema.buscar_usuario_por_id(1)
+    assert usuario is not None
+    assert usuario.emprestimos_ativos == (CICLOS_SOBREPOSTOS,)
+    ultimo = sistema.emprestimos.obter(CICLOS_SOBREPOSTOS)
+    assert ultimo is not None
+    # Com a cadeia de versões, repr e hash estouravam o limite de recursão
+    repr(usuario), hash(usuario), repr(ultimo), hash(ultimo)
+
+
+def test_relatorios_concorrentes_com_emprestimos_e_devolucoes(
+    sistema_populado: SistemaBiblioteca, gerar_isbn: Callable[[int], str]
+) -> None:
+    """Relatórios sobre snapshots não veem estado parcial durante a circulação."""
+    sistema = sistema_populado
+    erros: List[BaseException] = []
+    escritores_ativos = threading.Event()
+    escritores_ativos.set()
+
+    def escritor(indice: int) -> None:
+        # Cada escritor usa seus próprios usuários e livros
+        try:
+            for passo in range(OPERACOES_POR_ESCRITOR):
+                id_usuario = indice * (USUARIOS // ESCRITORES) + passo % 5 + 1
+                livro = indice * (LIVROS // ESCRITORES) + passo % 10
+                if sistema.realizar_emprestimo(id_usuario, gerar_isbn(livro), 7):
+                    if passo % 3:
+                        ativos = sistema.buscar_usuario_por_id(id_usuario)
+                        assert ativos is not None
+                        sistema.realizar_devolucao(ativos.emprestimos_ativos[0])
+        except BaseException as erro:  # pragma: no cover - falha reportada abaixo
+            erros.append(erro)
+
+    def leitor() -> None:
+        relatorios = Relatorios(sistema)
+        try:
+            while escritores_ativos.is_set():
+                _verificar_consistencia(sistema.snapshot())
+                relatorios.historico_emprestimos()
+                relatorios.livros_mais_emprestados()
+                relatorios.usuarios_mais_ativos()
+        except BaseException as erro:  # pragma: no cover - falha reportada abaixo
+            erros.append(erro)
+
+    escritores = [
+        threading.Thread(target=escritor, args=(i,)) for i in range(ESCRITORES)
+    ]
+    leitores = [threading.Thread(target=leitor) for _ in range(2)]
+    for thread in leitores + escritores:
+        thread.start()
+    for thread in escritores:
+        thread.join()
+    escritores_ativos.clear()
+    for thread in leitores:
+        thread.join()
+
+    assert not erros, erros
+    assert len(sistema.snapshot().emprestimos) > 0
+    _verificar_consistencia(sistema.snapshot())
+
+
+def test_tabela_versionada_copia_apenas_na_escrita() -> None:
+    """Escritas após uma visão não a alteram e reaproveitam blocos intactos."""
+    tabela: TabelaVersionada[int, str] = TabelaVersionada(tamanho_bloco=4)
+    for i in range(10):
+        tabela.definir(i, f"v{i}")
+    visao = tabela.visao()
+
+    tabela.definir(0, "alterado")
+    tabela.definir(10, "novo")
+    tabela.remover(9)
+
+    assert list(visao) == [f"v{i}" for i in range(10)]
+    assert len(visao) == 10
+    atual = tabela.visao()
+    assert list(atual) == ["alterado"] + [f"v{i}" for i in range(1, 9)] + ["novo"]
+    # O bloco do meio não foi tocado e continua compartilhado entre as visões
+    assert visao._blocos[1] is atual._blocos[1]
+
+
+def test_tabela_versionada_obter_apos_descarte_do_bloco() -> None:
+    """Ler uma chave cujo bloco foi descartado devolve None, sem KeyError."""
+    tabela: TabelaVersionada[int, str] = TabelaVersionada(tamanho_bloco=2)
+    for i in range(4):
+        tabela.definir(i, f"v{i}")
+    numero = tabela._bloco_da_chave[0]
+    tabela.remover(0)
+    tabela.remover(1)
+    # Simula um leitor que consultou o índice antes da remoção
+    tabela._bloco_da_chave[0] = numero
+
+    assert tabela.obter(0) is None
+    assert tabela.obter(2) == "v2"